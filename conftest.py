@@ -0,0 +1,89 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from PyQt6.QtCore import QEvent
+from PyQt6.QtWidgets import QApplication
+
+from lib.calculator import Calculator
+from lib.canvas import Canvas
+from lib.clock import Clock
+from lib.pv_editor import PVEditor
+from lib.pv_item import PVItem
+
+# Run without a display server unless the environment asks for a specific platform plugin
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def qapp():
+    """
+    Returns the QApplication shared by all tests (one per test session, or per worker under pytest-xdist).
+    """
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+@pytest.fixture(autouse=True)
+def slot_exceptions(monkeypatch):
+    """
+    Returns the exceptions raised in Qt slots during the test, and fails the test if there are any. PyQt hands them to
+    `sys.excepthook` instead of the code that emitted the signal, so they would pass unnoticed otherwise.
+    """
+    exceptions = []
+    monkeypatch.setattr(sys, "excepthook", lambda exc_type, exc, traceback: exceptions.append(exc))
+    yield exceptions
+    if exceptions:
+        pytest.fail(f"Exceptions raised in Qt slots: {exceptions!r}")
+
+
+@pytest.fixture
+def main_window():
+    """
+    Returns a stand-in for the main window with the canvas the PV editor draws on.
+    """
+    canvas = Canvas()
+    yield SimpleNamespace(canvas=canvas)
+    canvas.close()
+
+
+@pytest.fixture
+def pv_editor(main_window):
+    """
+    Returns an empty PV editor of the `main_window` fixture.
+    """
+    pv_editor = PVEditor(main_window)
+    yield pv_editor
+    pv_editor.reset()  # stops the items' PV monitors
+    # The table deletes the item widgets later; do it while the editor is still alive, not in a later test's event loop
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+@pytest.fixture
+def pv_item(pv_editor):
+    """
+    Returns a blank PV item of the `pv_editor` fixture (not added to its table).
+    """
+    item = PVItem(pv_editor)
+    yield item
+    item.releasePV()
+
+
+@pytest.fixture
+def clock():
+    """
+    Returns a stopped clock.
+    """
+    clock = Clock()
+    yield clock
+    clock.timer.stop()
+
+
+@pytest.fixture
+def calculator():
+    """
+    Returns a calculator with its worker thread running.
+    """
+    calculator = Calculator()
+    yield calculator
+    calculator.stop()
@@ -1,7 +1,11 @@
+import threading
+import time
 import numpy as np
 from datetime import datetime
 from scipy import signal
 
+MONITOR_PERIOD = 0.05  # seconds between emulated monitor updates
+
 def random_flat(sec=5, s0=10, s1=1, s2=10):
     t0 = datetime.now()
     sd0 = t0.second
@@ -53,8 +57,13 @@ class PV(object):
         print(pv1.get())
         time.sleep(1)
     
+    # e.g. receive value updates (emulated CA monitor, called from a background thread)
+    pv2 = PV('dummy_pv_2', callback=lambda value=None, **kw: print(value), auto_monitor=True)
+    ...
+    pv2.disconnect()
+    
     """
-    def __init__(self, name):
+    def __init__(self, name, callback=None, form='time', auto_monitor=None):
         """Choose from 'dummy_pv_0', 'dummy_pv_1', 'dummy_pv_2', or 'dummy_pv_3'"""
         if name == 'dummy_pv_0':
             self.func = lambda: random_flat(sec=5, s0=10, s1=1, s2=10)
@@ -67,7 +76,16 @@ class PV(object):
         else:
             raise NameError("PV name was not found.")
         
+        self.pvname = name
+        self.form = form  # accepted for compatibility; values are always plain floats
         self.t = 1.0
+        self.callbacks = {}
+        self._stop = threading.Event()
+        
+        if callback is not None:
+            self.add_callback(callback)
+        if auto_monitor:
+            threading.Thread(target=self._monitor, daemon=True).start()
             
     def random_walk(self, s0=10):
         v0 = np.random.randn()
@@ -75,4 +93,26 @@ class PV(object):
         return self.t
             
     def get(self):
-        return self.func()
\ No newline at end of file
+        return self.func()
+    
+    def add_callback(self, callback, index=None):
+        """Add a function called as callback(pvname=..., value=..., timestamp=...) on each monitor update"""
+        if index is None:
+            index = len(self.callbacks) + 1
+        self.callbacks[index] = callback
+        return index
+    
+    def remove_callback(self, index):
+        self.callbacks.pop(index, None)
+            
+    def disconnect(self):
+        """Stop monitor updates and drop all callbacks"""
+        self._stop.set()
+        self.callbacks.clear()
+    
+    def _monitor(self):
+        while not self._stop.wait(MONITOR_PERIOD):
+            value = self.get()
+            timestamp = time.time()
+            for callback in list(self.callbacks.values()):
+                callback(pvname=self.pvname, value=value, timestamp=timestamp)
\ No newline at end of file
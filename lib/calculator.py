@@ -1,4 +1,5 @@
-from copy import deepcopy
+import queue
+import weakref
 
 import numpy as np
 import pandas as pd
@@ -6,7 +7,8 @@ from PyQt6.QtCore import QThread, pyqtSignal
 
 from lib.pv_item import PVItem
 
-# Global constant for aggregation function
+# Global constant for aggregation function (the name of a Rolling/ExponentialMovingWindow method, called directly to skip
+# the string dispatch of `agg`)
 AGG_FUNC = "mean"
 
 def adaptive_average(waveR, phase_threshold=0.5, n_avg=8):
@@ -53,70 +55,157 @@ def adaptive_average(waveR, phase_threshold=0.5, n_avg=8):
 
 class Calculator(QThread):
     """
-    A threaded calculator class for performing data processing operations on items in a PV editor.
+    A persistent threaded calculator class for performing data processing operations on snapshots of PV items.
 
     Attributes:
-        calculatedRW (pyqtSignal): Signal emitted upon completion of rolling window calculation.
-        calculatedEWM (pyqtSignal): Signal emitted upon completion of exponential weighted mean calculation.
-        calculatedAA (pyqtSignal): Signal emitted upon completion of adaptive average calculation.
+        calculated (pyqtSignal): Signal emitted once per snapshot with the list of its results, each as a tuple of the
+                                 kind ("RW", "EWM", or "AA"), the PV item, the snapshot's sample times, and the result.
+        failed (pyqtSignal): Signal emitted with the PV item and the error message when its calculations raise, once
+                             per calculator kwargs.
 
     Methods:
-        __init__: Initializes the Calculator object with a PV editor.
-        run: Overrides the run method of QThread; iterates over PV editor items, performs calculations, and emits signals.
+        __init__: Initializes the Calculator object and starts its worker thread.
+        submit: Posts a snapshot of PV items to be calculated, replacing any pending one.
+        stop: Stops the worker thread and waits for it to finish.
+        run: Overrides the run method of QThread; waits for snapshots, performs calculations, and emits signals.
+        _calculate: Performs calculations on a snapshot of PV items and emits signals.
+        _calculateItem: Performs the calculations of one PV item.
+        _memoized: Returns the last result of a calculation if its inputs are unchanged, or computes and caches it.
     """
-    calculatedRW = pyqtSignal(PVItem, list)
-    calculatedEWM = pyqtSignal(PVItem, list)
-    calculatedAA = pyqtSignal(PVItem, list)
+    calculated = pyqtSignal(list)  # [(kind, item, sample times, result)]
+    failed = pyqtSignal(object, str)  # (item, error message)
     
-    def __init__(self, pv_editor, data_pnt_limiter):
+    def __init__(self):
         """
-        Initializes a new Calculator instance.
+        Initializes a new Calculator instance and starts its worker thread.
+        """
+        
+        super().__init__()
+        self._queue = queue.Queue(maxsize=1)  # holds at most one pending snapshot
+        self._results = weakref.WeakKeyDictionary()  # {item: {kind: (key, result)}}, only used by the worker thread
+        self._failures = weakref.WeakKeyDictionary()  # {item: calculator kwargs that last failed}, same
+        self.start()
+        
+    def submit(self, snapshot):
+        """
+        Posts a snapshot to the worker thread. Any snapshot still pending is dropped (newest wins).
 
         Args:
-            pv_editor (iterable): The PV editor containing items for calculation.
+            snapshot (list): List of (PVItem, samples, sample times, sample version, calculator kwargs) tuples, or None to
+                stop the worker.
         """
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put_nowait(snapshot)
         
-        super().__init__()
-        self.pv_editor = pv_editor
-        self.data_pnt_limiter = data_pnt_limiter
+    def stop(self):
+        """
+        Stops the worker thread and waits for it to finish.
+        """
+        self.submit(None)
+        self.wait()
         
     def run(self):
         """
         Overrides the run method of QThread.
-        Iterates over items in the PV editor, performs calculations, and emits signals.
+        Waits for snapshots and performs calculations on them until stopped.
+        """
+        while True:
+            snapshot = self._queue.get()
+            if snapshot is None:
+                break
+            self._calculate(snapshot)
+            
+    def _calculate(self, snapshot):
+        """
+        Performs calculations on a snapshot of PV items and emits all of their results in one signal, so the GUI thread
+        handles a single queued call per snapshot. An item whose calculations raise (e.g. an EWM with both com and span)
+        is reported through `failed` and left out, without stopping the worker or the other items.
+
+        Args:
+            snapshot (list): List of (PVItem, samples, sample times, sample version, calculator kwargs) tuples.
+        """
+        results = []
+        for item, samples, sample_times, version, calc_kwargs in snapshot:
+            try:
+                # The sample times go along, as the item's own have moved on by the time the GUI thread draws the result
+                results.extend((kind, item, sample_times, result)
+                               for kind, result in self._calculateItem(item, samples, version, calc_kwargs))
+            except Exception as exc:
+                # Report once per kwargs, as every later snapshot fails the same way until they change
+                if self._failures.get(item) != calc_kwargs:
+                    self._failures[item] = calc_kwargs
+                    self.failed.emit(item, str(exc))
+            else:
+                self._failures.pop(item, None)
+                
+        if results:
+            self.calculated.emit(results)
+            
+    def _calculateItem(self, item, samples, version, calc_kwargs):
+        """
+        Performs the rolling window, exponentially weighted mean, and adaptive average calculations of one PV item.
+
+        Args:
+            item (PVItem): The PV item.
+            samples (ndarray): The samples to calculate over.
+            version (int): The sample version of the item.
+            calc_kwargs (dict): Calculator-ready kwargs per calculated section (None if disabled).
+
+        Returns:
+            list: List of (kind, result) tuples.
         """
-        sample_limit = self.data_pnt_limiter.getValue()
+        # Calculator-ready parameters for rolling window, exponential weighted mean, and adaptive average
+        rw_kwargs = calc_kwargs["rolling_window"]
+        ewm_kwargs = calc_kwargs["ewm"]
+        aa_kwargs = calc_kwargs["adaptive"]
+        num_samples = len(samples)
+        results = []
         
-        for item in self.pv_editor:
-            kwargs = deepcopy(item.params["kwargs"])  # Create a deep copy to avoid modifying the original data
+        # Check if rolling window is enabled
+        if rw_kwargs is not None:
+            # Apply rolling window and collect the result
+            rw_result = self._memoized(item, "RW", (version, num_samples, rw_kwargs),
+                                       lambda: getattr(pd.Series(samples, copy=False).rolling(**rw_kwargs), AGG_FUNC)().to_numpy(copy=False))
+            results.append(("RW", rw_result))
             
-            # Extract parameters for rolling window, exponential weighted mean, and adaptive average
-            rw_kwargs = kwargs.get("rolling_window", {})
-            ewm_kwargs = kwargs.get("ewm", {})
-            aa_kwargs = kwargs.get("adaptive", {})
+        # Check if exponential weighted mean is enabled
+        if ewm_kwargs is not None:
+            # Apply exponential weighted mean and collect the result
+            ewm_result = self._memoized(item, "EWM", (version, num_samples, ewm_kwargs),
+                                        lambda: getattr(pd.Series(samples, copy=False).ewm(**ewm_kwargs), AGG_FUNC)().to_numpy(copy=False))
+            results.append(("EWM", ewm_result))
             
-            samples = item.samples[-sample_limit:] if sample_limit and sample_limit < len(item.samples) else item.samples
+        # Check if adaptive average is enabled
+        if aa_kwargs is not None:
+            # Apply adaptive average and collect the result
+            aa_result = self._memoized(item, "AA", (version, num_samples, aa_kwargs),
+                                       lambda: adaptive_average(samples, **aa_kwargs))
+            results.append(("AA", aa_result))
             
-            # Check if rolling window is enabled
-            if rw_kwargs.get("enabled", False):
-                del rw_kwargs["enabled"]  # Remove the 'enabled' key to avoid interfering with the rolling function
-                
-                # Apply rolling window and emit the result signal
-                rw_result = pd.Series(samples).rolling(**rw_kwargs).agg(AGG_FUNC).tolist()
-                self.calculatedRW.emit(item, rw_result)
-                
-            # Check if exponential weighted mean is enabled
-            if ewm_kwargs.get("enabled", False):
-                del ewm_kwargs["enabled"]  # Remove the 'enabled' key
-                
-                # Apply exponential weighted mean and emit the result signal
-                ewm_result = pd.Series(samples).ewm(**ewm_kwargs).agg(AGG_FUNC).tolist()
-                self.calculatedEWM.emit(item, ewm_result)
+        return results
                 
-            # Check if adaptive average is enabled
-            if aa_kwargs.get("enabled", False):
-                del aa_kwargs["enabled"]  # Remove the 'enabled' key
-                
-                # Apply adaptive average and emit the result signal
-                aa_result = adaptive_average(samples, **aa_kwargs)
-                self.calculatedAA.emit(item, aa_result)
\ No newline at end of file
+    def _memoized(self, item, kind, key, compute):
+        """
+        Returns the last result of a calculation if it was computed from the same inputs, so repaints without new samples
+        (e.g. while the clock is paused) skip the recomputation; otherwise computes and caches it.
+
+        Args:
+            item (PVItem): The PV item the calculation is for.
+            kind (str): The kind of calculation ("RW", "EWM", or "AA").
+            key (tuple): The inputs of the calculation: (sample version, number of samples, kwargs).
+            compute (callable): Computes the result.
+
+        Returns:
+            The (possibly cached) result.
+        """
+        results = self._results.setdefault(item, {})
+        cached = results.get(kind)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        result = compute()
+        results[kind] = (key, result)
+        return result
\ No newline at end of file
@@ -162,7 +162,8 @@ class Canvas(pg.GraphicsLayoutWidget):
         
         curve.setData(x=x, y=y)
         
-        if pen:
+        # Restyling redraws the curve's items, so only set a pen that differs from the current one
+        if pen and pen != curve.opts["pen"]:
             curve.setPen(pen)
             
         if subplot_id is not None:
@@ -14,6 +14,7 @@ class CriticalDialog(QMessageBox):
 
     Methods:
         __init__: Initializes the CriticalDialog with the specified error message and parent widget.
+        setMessage: Sets the error message, so the dialog can be reused for another error.
     """
     def __init__(self, error_message: str, parent):
         """
@@ -29,4 +30,13 @@ class CriticalDialog(QMessageBox):
         self.setWindowTitle(TITLE)
         self.setIcon(ICON)
         self.setText(ERROR_TEXT)
+        self.setMessage(error_message)
+        
+    def setMessage(self, error_message: str):
+        """
+        Sets the error message, so the dialog can be reused for another error.
+
+        Args:
+            error_message (str): The error message to be displayed.
+        """
         self.setInformativeText(error_message)
\ No newline at end of file
@@ -1,15 +1,17 @@
 import os
+from functools import lru_cache
 
 from PyQt6.QtWidgets import QMainWindow, QGridLayout, QWidget, QSlider
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIcon
+from PyQt6.QtGui import QIcon, QPen
 from pyqtgraph import mkPen
 
 from lib.calculator import Calculator
 from lib.canvas import Canvas
 from lib.clock import Clock
+from lib.critical_dialog import CriticalDialog
 from lib.menu_bar import MenuBar
-from lib.pv_editor import PVEditor
+from lib.pv_editor import PVEditor, SECTION_EXTENSIONS
 from lib.data_point_limiter import DataPointLimiter
 
 # Global constants for the main window
@@ -20,9 +22,31 @@ PEN_WIDTH = 2
 CLOCK_HEIGHT = 75
 SLIDER_HEIGHT = 70
 
-RW_EXTENSION = " Rolling-Window"
-EWM_EXTENSION = " Exponentially Weighted"
-AA_EXTENSION = " Adaptive Average"
+RW_EXTENSION = SECTION_EXTENSIONS["rolling_window"]
+EWM_EXTENSION = SECTION_EXTENSIONS["ewm"]
+AA_EXTENSION = SECTION_EXTENSIONS["adaptive"]
+CURVE_EXTENSIONS = {"RW": RW_EXTENSION, "EWM": EWM_EXTENSION, "AA": AA_EXTENSION}
+CURVE_SECTIONS = {"RW": "rolling_window", "EWM": "ewm", "AA": "adaptive"}  # {kind: kwargs section}
+CURVE_PEN_STYLES = {"RW": Qt.PenStyle.DashLine, "EWM": Qt.PenStyle.DotLine, "AA": Qt.PenStyle.DashDotLine}
+CURVE_SUFFIXES = tuple(CURVE_EXTENSIONS.values())
+
+
+@lru_cache(maxsize=None)
+def curve_pen(color: str, kind: str = None) -> QPen:
+    """
+    Returns the pen for a curve of the given color and kind. Pens are created once per combination and shared, instead
+    of on every tick.
+
+    Args:
+        color (str): The curve color.
+        kind (str, optional): The kind of calculated curve ("RW", "EWM", or "AA"), or None for the original data.
+
+    Returns:
+        QPen: The pen.
+    """
+    if kind is None:
+        return mkPen(color=color, width=PEN_WIDTH)
+    return mkPen(color=color, width=PEN_WIDTH, style=CURVE_PEN_STYLES[kind])
 
 
 class MainWindow(QMainWindow):
@@ -38,6 +62,7 @@ class MainWindow(QMainWindow):
     Methods:
         __init__: Initializes the MainWindow with layout and components.
         reset: Resets the state of PV editor, canvas, and clock to default values.
+        closeEvent: Stops the calculator's worker thread before the window closes.
         _createMainThreadScripts: Creates main thread scripts for clock timeout and calculator signals.
     """
     def __init__(self):
@@ -55,7 +80,7 @@ class MainWindow(QMainWindow):
         self.canvas = Canvas()
         self.pv_editor = PVEditor(self)
         self.data_pnt_limiter = DataPointLimiter()
-        self.calculator = Calculator(self.pv_editor, self.data_pnt_limiter)
+        self.calculator = Calculator()
         self.clock = Clock()
         
         # Set up the layout
@@ -83,20 +108,28 @@ class MainWindow(QMainWindow):
         self.canvas.reset()
         self.clock.reset()
         
+    def closeEvent(self, event):
+        """
+        Stops the calculator's worker thread before the window closes.
+        """
+        self.calculator.stop()
+        super().closeEvent(event)
+        
     def _createMainThreadScripts(self):
         """
         Creates main thread scripts for clock timeout and calculator signals.
 
         This method defines functions for handling clock timeout and calculator signals, connecting them to the appropriate
         slots. It ensures the generation, drawing, and cleanup of samples in the PV editor's canvas. Additionally, it manages
-        the updating or adding of curves on the canvas based on the draw settings of each PV item. The calculator signals
-        trigger the plotting of calculated rolling window (RW), exponentially weighted moving average (EWM), and adaptive
-        average (AA) curves.
+        the updating or adding of curves on the canvas based on the draw settings of each PV item. The calculator's
+        signal triggers the plotting of calculated rolling window (RW), exponentially weighted moving average (EWM), and
+        adaptive average (AA) curves.
 
         The method establishes connections between the signals of the clock, calculator, and the corresponding functions.
         """
         def updateCanvas(sample: bool = True):
             # Generate new samples & draw (if enabled)
+            snapshot = []
             for item in self.pv_editor:
                 if not item.pv:
                     continue
@@ -104,90 +137,99 @@ class MainWindow(QMainWindow):
                 if sample:
                     item.sample()
                     
-                pen = mkPen(color=item.params["color"], width=PEN_WIDTH)
-        
-                draw_enabled = item.params.get("kwargs", {}).get("original", {}).get("enabled", False)
+                pen = curve_pen(item.params["color"])
+                render_spec = item.render_spec
+                draw_enabled = render_spec.original
                 
                 sample_limit = self.data_pnt_limiter.getValue()
-                samples = item.samples[-sample_limit:] if sample_limit and sample_limit < len(item.samples) else item.samples
+                samples, sample_times = item.recent(sample_limit)
+                calc_kwargs = item.calcKwargs(sample_limit)
+                if calc_kwargs is not None:
+                    # Copied, as the ring buffer is overwritten while the calculator runs
+                    snapshot.append((item, samples.copy(), sample_times.copy(), item.sample_version, calc_kwargs))
                 
-                if draw_enabled and self.canvas.isCurve(item.params["name"]):
-                    self.canvas.updateCurve(item.params["name"], item.sample_times[-len(samples):], samples, pen, item.params["subplot_id"])
-                elif draw_enabled and not self.canvas.isCurve(item.params["name"]):
-                    self.canvas.addCurve(item.params["name"], item.sample_times[-len(samples):], samples, pen, item.params["subplot_id"])
-                elif not draw_enabled and self.canvas.isCurve(item.params["name"]):
-                    self.canvas.removeCurve(item.params["name"])
+                label = item.curve_labels["original"]
+                is_curve = self.canvas.isCurve(label)
+                if draw_enabled and is_curve:
+                    self.canvas.updateCurve(label, sample_times, samples, pen, item.params["subplot_id"])
+                elif draw_enabled:
+                    self.canvas.addCurve(label, sample_times, samples, pen, item.params["subplot_id"])
+                elif is_curve:
+                    self.canvas.removeCurve(label)
+                    
+                # Draw the rolling window and EWM if the item streams them (otherwise the calculator computes them)
+                if render_spec.streamed_rolling_window:
+                    drawCalculated("RW", item, sample_times, item.rollingMean(sample_limit))
+                if render_spec.streamed_ewm:
+                    ewm_mean = item.ewmMean(sample_limit)
+                    if ewm_mean is not None:  # None if the data point limit leaves samples out
+                        drawCalculated("EWM", item, sample_times, ewm_mean)
                 
-            # Canvas clean-up
-            names = [item.params["name"] for item in self.pv_editor]
+            # Canvas clean-up (remove the curves of PVs that no longer exist)
             for label in self.canvas.getCurveLabels():
-                label_temp = label.replace(RW_EXTENSION, "")
-                label_temp = label_temp.replace(EWM_EXTENSION, "")
-                label_temp = label_temp.replace(AA_EXTENSION, "")
-                if label_temp not in names:
+                # Each curve carries at most one suffix
+                base = next((label.removesuffix(suffix) for suffix in CURVE_SUFFIXES if label.endswith(suffix)), label)
+                if self.pv_editor.itemByName(base) is None:
                     self.canvas.removeCurve(label)
                     
-            # Run Calculator
-            if not self.calculator.isRunning():
-                self.calculator.start()
+            # Post the snapshot to the calculator
+            self.calculator.submit(snapshot)
                 
-        def onCalculatedRW(item, result):
+        def onCalculated(results):
             """
-            Callback function triggered on calculated rolling window (RW) signal from the calculator.
+            Callback function triggered on a calculated signal from the calculator.
 
-            This function handles the calculated RW data and updates the canvas with the appropriate pen settings.
+            Draws all results of a snapshot with the canvas' updates disabled, so they cause a single repaint. Results of
+            PV items removed from the editor since the snapshot are dropped, so they don't add their curves back.
 
             Args:
-                item (PVItem): The PVItem for which the RW is calculated.
-                result (List[float]): The calculated RW data.
-
+                results (list): List of (kind, item, sample times, result) tuples.
             """
-            name = item.params["name"] + RW_EXTENSION
-            pen = mkPen(color=item.params["color"], width=PEN_WIDTH, style=Qt.PenStyle.DashLine)
-            if self.canvas.isCurve(name):
-                self.canvas.updateCurve(name, item.sample_times[-len(result):], result, pen, item.params["subplot_id"])
-            else:
-                self.canvas.addCurve(name, item.sample_times[-len(result):], result, pen, item.params["subplot_id"])
-        
-        def onCalculatedEWM(item, result):
+            self.canvas.setUpdatesEnabled(False)
+            try:
+                for kind, item, sample_times, result in results:
+                    name = item.params["name"]
+                    if name is not None and self.pv_editor.itemByName(name) is item:
+                        drawCalculated(kind, item, sample_times, result)
+            finally:
+                self.canvas.setUpdatesEnabled(True)
+                
+        def onCalculationFailed(item, error_message):
             """
-            Callback function triggered on calculated exponentially weighted moving average (EWM) signal from the calculator.
+            Callback function triggered on a failed signal from the calculator.
 
-            This function handles the calculated EWM data and updates the canvas with the appropriate pen settings.
+            Shows the error in a critical dialog, unless the PV item was removed from the editor in the meantime.
 
             Args:
-                item (PVItem): The PVItem for which the EWM is calculated.
-                result (List[float]): The calculated EWM data.
-
+                item (PVItem): The PVItem whose calculations failed.
+                error_message (str): The error message.
             """
-            name = item.params["name"] + EWM_EXTENSION
-            pen = mkPen(color=item.params["color"], width=PEN_WIDTH, style=Qt.PenStyle.DotLine)
-            if self.canvas.isCurve(name):
-                self.canvas.updateCurve(name, item.sample_times[-len(result):], result, pen, item.params["subplot_id"])
-            else:
-                self.canvas.addCurve(name, item.sample_times[-len(result):], result, pen, item.params["subplot_id"])
-        
-        def onCalculatedAA(item, result):
+            name = item.params["name"]
+            if name is not None and self.pv_editor.itemByName(name) is item:
+                CriticalDialog(f"{name}: {error_message}", self).exec()
+                
+        def drawCalculated(kind, item, sample_times, result):
             """
-            Callback function triggered on calculated adaptive average (AA) signal from the calculator.
-
-            This function handles the calculated AA data and updates the canvas with the appropriate pen settings.
+            Draws calculated rolling window (RW), exponentially weighted moving average (EWM), or adaptive average (AA)
+            data, updating the canvas with the pen style of its kind.
 
             Args:
-                item (PVItem): The PVItem for which the AA is calculated.
-                result (List[float]): The calculated AA data.
+                kind (str): The kind of calculation ("RW", "EWM", or "AA").
+                item (PVItem): The PVItem for which the data is calculated.
+                sample_times (ndarray): The sample times of the samples the data is calculated from.
+                result (ndarray): The calculated data.
 
             """
-            name = item.params["name"] + AA_EXTENSION
-            pen = mkPen(color=item.params["color"], width=PEN_WIDTH, style=Qt.PenStyle.DashDotLine)
+            name = item.curve_labels[CURVE_SECTIONS[kind]]
+            sample_times = sample_times[len(sample_times) - len(result):]
+            pen = curve_pen(item.params["color"], kind)
             if self.canvas.isCurve(name):
-                self.canvas.updateCurve(name, item.sample_times[-len(result):], result, pen, item.params["subplot_id"])
+                self.canvas.updateCurve(name, sample_times, result, pen, item.params["subplot_id"])
             else:
-                self.canvas.addCurve(name, item.sample_times[-len(result):], result, pen, item.params["subplot_id"])
+                self.canvas.addCurve(name, sample_times, result, pen, item.params["subplot_id"])
             
         self.clock.timer.timeout.connect(updateCanvas)
-        self.calculator.calculatedRW.connect(onCalculatedRW)
-        self.calculator.calculatedEWM.connect(onCalculatedEWM)
-        self.calculator.calculatedAA.connect(onCalculatedAA)
+        self.calculator.calculated.connect(onCalculated, Qt.ConnectionType.QueuedConnection)  # emitted on the worker thread
+        self.calculator.failed.connect(onCalculationFailed, Qt.ConnectionType.QueuedConnection)
         self.pv_editor.updated.connect(lambda: updateCanvas(sample=False) if not self.clock.timer.isActive() else None)
         self.data_pnt_limiter.slider.valueChanged.connect(lambda: updateCanvas(sample=False) if not self.clock.timer.isActive() else None)
\ No newline at end of file
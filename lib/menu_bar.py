@@ -1,17 +1,267 @@
 import os
+import csv
 import json
+from contextlib import nullcontext
+from itertools import chain, repeat
 from datetime import datetime
 
 from PyQt6.QtWidgets import QMenuBar, QFileDialog, QMenu
 from PyQt6.QtGui import QAction
+from PyQt6.QtCore import Qt, QObject, QRunnable, QSettings, QThreadPool, pyqtSignal
 
-from pandas import DataFrame, read_csv, read_json
+import numpy as np
+import pyarrow as pa
+from pyarrow import feather, parquet
+from pandas import read_csv, read_json
+from pandas.errors import EmptyDataError
+
+from lib.critical_dialog import CriticalDialog
+from lib.pv_item import connection_queue
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard library encoder/decoder
+    orjson = None
 
 # Global constants for file extensions and headers
 SAMPLE_HEADER_EXT = "_samples"
 SAMPLE_TIME_HEADER_EXT = "_sample_times"
+HEADER_SUFFIXES = {SAMPLE_HEADER_EXT: 0, SAMPLE_TIME_HEADER_EXT: 1}  # {suffix: index in [samples, sample_times]}
 DEFAULT_SAVE_DATA_EXT = ".csv"
 DEFAULT_SAVE_PARAMS_EXT = ".json"
+DATA_FILE_EXTS = (".json", ".csv", ".feather", ".parquet")
+ARROW_FILE_EXTS = (".feather", ".parquet")  # binary columnar formats handled by pyarrow
+DATA_FILE_FILTER = "All Files (*);;JSON Files (*.json);;CSV Files (*.csv);;Feather Files (*.feather);;Parquet Files (*.parquet)"
+FEATHER_COMPRESSION = "lz4"
+READ_CHUNK_SIZE = 65536  # rows parsed per chunk when opening data
+WRITE_BUFFER_SIZE = 1 << 20  # bytes buffered when saving data
+JSON_INDENT = 2
+FILE_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"  # zero-padded so default file names sort chronologically
+SETTINGS_ORGANIZATION = "TDA"
+SETTINGS_APPLICATION = "paths"
+
+
+def dumps_json(obj, indent: bool = False) -> bytes:
+    """
+    Serializes an object to JSON bytes, using orjson when available.
+
+    Args:
+        obj: The object to serialize. NumPy scalars and arrays are supported.
+        indent (bool, optional): Whether to indent the output. Default is False.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=JSON_INDENT if indent else None).encode()
+
+
+def loads_json(data: bytes):
+    """
+    Deserializes JSON bytes, using orjson when available.
+
+    Args:
+        data (bytes): The JSON document.
+
+    Returns:
+        The deserialized object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_data_file(file_path: str) -> dict:
+    """
+    Reads a data file and pairs its sample and sample time columns by PV name.
+
+    Args:
+        file_path (str): Path of a file with one of the `DATA_FILE_EXTS` extensions.
+
+    Returns:
+        dict: {name: [samples, sample_times]} with float64 arrays.
+
+    Raises:
+        ValueError: If the file isn't a supported data file, or a PV lacks its sample or sample time column.
+    """
+    _, file_extension = os.path.splitext(file_path)
+    
+    if file_extension in ARROW_FILE_EXTS:
+        # Read the columnar file in one go (nulls become NaN)
+        table = feather.read_table(file_path) if file_extension == ".feather" else parquet.read_table(file_path)
+        data = {header: column.to_numpy() for header, column in zip(table.column_names, table.columns)}
+    elif file_extension == ".json" and _json_start(file_path) == b"[":
+        # Files saved by earlier versions hold a single array of row objects
+        frame = read_json(file_path, orient="records", dtype=np.float64, precise_float=True)
+        data = {header: frame[header].to_numpy(np.float64) for header in frame.columns}
+    else:
+        # Stream data from the selected file in chunks based on its format (JSON is stored as JSON Lines)
+        if file_extension == ".json":
+            if _json_start(file_path) not in (b"{", b""):
+                raise ValueError(f"Unsupported data file format: '{file_path}' is neither JSON Lines nor a JSON array.")
+            reader = read_json(file_path, lines=True, chunksize=READ_CHUNK_SIZE, dtype=np.float64, precise_float=True)
+        else:
+            try:
+                reader = read_csv(file_path, engine="c", memory_map=True, chunksize=READ_CHUNK_SIZE, dtype=np.float64,
+                                  float_precision="round_trip")
+            except EmptyDataError:  # a CSV file saved without any PVs has no header row
+                reader = nullcontext(())
+        
+        # Collect each column's chunks as float64 arrays and join them once
+        column_chunks = {}
+        with reader as chunks:
+            for chunk in chunks:
+                for header in chunk.columns:
+                    column_chunks.setdefault(header, []).append(chunk[header].to_numpy())
+        data = {header: np.concatenate(arrays) for header, arrays in column_chunks.items()}
+    
+    # Pair sample and time data by PV name in a single pass
+    pairs = {}
+    for header, vals in data.items():
+        header = str(header)
+        for suffix, index in HEADER_SUFFIXES.items():
+            if header.endswith(suffix):
+                pairs.setdefault(header.removesuffix(suffix), [None, None])[index] = vals
+                break
+            
+    # Reject PVs missing a column here, as the items can't be built from them
+    incomplete = [name for name, pair in pairs.items() if pair[0] is None or pair[1] is None]
+    if incomplete:
+        names = ", ".join(f"'{name}'" for name in incomplete)
+        raise ValueError(f"'{file_path}' lacks the sample or sample time column of {names}.")
+    return pairs
+
+
+def _json_start(file_path: str) -> bytes:
+    """
+    Returns the first non-whitespace byte of a JSON file (b"" if there is none), which tells JSON Lines ('{') from a
+    JSON array ('[').
+
+    Args:
+        file_path (str): Path of the JSON file.
+    """
+    with open(file_path, 'rb') as file:
+        for line in file:
+            line = line.lstrip()
+            if line:
+                return line[:1]
+    return b""
+
+
+def write_data_file(file_path: str, columns: dict):
+    """
+    Writes sample columns to a data file, padding the front of shorter columns so the most recent samples share a row.
+    JSON Lines has no header row, so a JSON file of columns without any samples is read back without them.
+
+    Args:
+        file_path (str): Path of a file with one of the `DATA_FILE_EXTS` extensions.
+        columns (dict): {header: samples} of the columns to write.
+    """
+    _, file_extension = os.path.splitext(file_path)
+    max_num_samples = max(map(len, columns.values()), default=0)
+    
+    if file_extension in ARROW_FILE_EXTS:
+        # Build a columnar table, padding shorter columns with nulls
+        table = pa.table({header: pa.concat_arrays([pa.nulls(max_num_samples - len(vals), pa.float64()),
+                                                    pa.array(vals, pa.float64())])
+                          for header, vals in columns.items()})
+        if file_extension == ".feather":
+            feather.write_feather(table, file_path, compression=FEATHER_COMPRESSION)
+        else:
+            parquet.write_table(table, file_path)
+    else:
+        # Stream the rows to the file, lazily padding shorter columns with `None`
+        headers = list(columns)
+        rows = zip(*(chain(repeat(None, max_num_samples - len(vals)), vals) for vals in columns.values()))
+        if file_extension == ".json":
+            # One JSON object per row (JSON Lines)
+            with open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as file:
+                for row in rows:
+                    file.write(dumps_json(dict(zip(headers, row))) + b"\n")
+        else:
+            with open(file_path, 'w', newline='', buffering=WRITE_BUFFER_SIZE) as file:
+                writer = csv.writer(file, lineterminator="\n")
+                writer.writerow(headers)
+                writer.writerows(rows)
+
+
+def read_params_file(file_path: str) -> list:
+    """
+    Reads the PV parameters stored in a JSON file.
+
+    Args:
+        file_path (str): Path of the JSON file.
+
+    Returns:
+        list: The parameters of each PV item.
+    """
+    with open(file_path, 'rb') as file:
+        return loads_json(file.read())
+
+
+def write_bytes(file_path: str, data: bytes):
+    """
+    Writes bytes to a file in a single unbuffered call.
+
+    Args:
+        file_path (str): Path of the file.
+        data (bytes): The file contents.
+    """
+    with open(file_path, 'wb', buffering=0) as file:
+        file.write(data)
+
+
+class FileJobSignals(QObject):
+    """
+    Signals of a FileJob. Emitted from the worker thread and delivered to receivers on the GUI thread.
+
+    Attributes:
+        finished: Emitted with the function's return value when it completes.
+        failed: Emitted with the error message when the function raises.
+    """
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class FileJob(QRunnable):
+    """
+    Runs a file I/O function on a thread pool so the GUI stays responsive.
+
+    Attributes:
+        signals (FileJobSignals): Signals reporting the outcome of the job.
+
+    Methods:
+        __init__: Initializes the FileJob with the function and its arguments.
+        run: Calls the function and emits its result or error.
+    """
+    def __init__(self, func, *args):
+        """
+        Initializes a new FileJob instance.
+
+        Args:
+            func: The function to run.
+            *args: Positional arguments for the function.
+        """
+        super().__init__()
+        self.setAutoDelete(False)  # the menu bar holds the job until its signals are delivered
+        
+        self.signals = FileJobSignals()
+        self._func = func
+        self._args = args
+        
+    def run(self):
+        """
+        Calls the function and emits its result or error.
+        """
+        try:
+            result = self._func(*self._args)
+        except Exception as exc:
+            self.signals.failed.emit(str(exc))
+        else:
+            self.signals.finished.emit(result)
+
 
 class MenuBar(QMenuBar):
     """
@@ -19,6 +269,8 @@ class MenuBar(QMenuBar):
 
     Attributes:
         main_window: Reference to the main window.
+        _thread_pool (QThreadPool): Single-threaded pool running file I/O jobs in submission order.
+        _jobs (set): File jobs whose signals have not been delivered yet.
 
     Methods:
         __init__: Initializes the MenuBar with actions and menus.
@@ -26,6 +278,12 @@ class MenuBar(QMenuBar):
         onFileOpenParameters: Handles the File>Open>Parameters action.
         onFileSaveData: Handles the File>Save>Data action.
         onFileSaveParameters: Handles the File>Save>Parameters action.
+        onClearAction: Handles the Edit>Clear Sample Histories action.
+        _startJob: Runs a file I/O function on the thread pool.
+        _onDataLoaded: Creates PV items from loaded data.
+        _onParamsLoaded: Creates PV items from loaded parameters.
+        _lastDirectory: Returns the directory last used by a file dialog action.
+        _rememberDirectory: Stores the directory of a path chosen in a file dialog action.
     """
     def __init__(self, main_window):
         """
@@ -38,6 +296,14 @@ class MenuBar(QMenuBar):
                  
         self.main_window = main_window
         
+        # Persisted last-used directories of the file dialogs
+        self._settings = QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+        
+        # File I/O runs off the GUI thread; one worker keeps saves and opens of the same file ordered
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(1)
+        self._jobs = set()
+        
         # Create `File` menu actions and menus
         new_action = QAction("New", self)
         open_menu = QMenu("Open...", self)
@@ -80,89 +346,50 @@ class MenuBar(QMenuBar):
         """
         Handles the "Open Data" action. Opens a file dialog to load data.
         """
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open Data File...", "", "All Files (*);;JSON Files (*.json);;CSV Files (*.csv)")
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Data File...", self._lastDirectory("lastOpenData"), DATA_FILE_FILTER)
         _, file_extension = os.path.splitext(file_path)
         
         # Check if a valid file path with allowed extension is selected
-        if file_path and (file_extension == ".json" or file_extension == ".csv"):
-            # Read data from the selected file based on its format
-            with open(file_path, 'r') as file:
-                if "json" in file_path:
-                    data = read_json(file).to_dict(orient="list")
-                else:
-                    data = read_csv(file).to_dict(orient="list")
+        if file_path and file_extension in DATA_FILE_EXTS:
+            self._rememberDirectory("lastOpenData", file_path)
             
-            # Reset the main window before loading new data
-            self.main_window.reset()
-            
-            # Separate sample and time data
-            sample_map = {}
-            times_map = {}
-            for header, vals in data.items():
-                if SAMPLE_HEADER_EXT in header:
-                    # Extract sample name and map to values
-                    name = header.replace(SAMPLE_HEADER_EXT, "")
-                    sample_map[name] = vals
-                else:
-                    # Extract sample time name and map to values
-                    name = header.replace(SAMPLE_TIME_HEADER_EXT, "")
-                    times_map[name] = vals
-                    
-            # Iterate through sample names and create PV items
-            for name in sample_map.keys():
-                # Add a new PVItem to the PV editor
-                item = self.main_window.pv_editor.addItem()
-                
-                # Set sample and time data for the PVItem
-                item.samples = sample_map[name]
-                item.sample_times = times_map[name]
-                
-                # Update parameters for the PVItem
-                item.updateParams({"name": name})
+            # Parse the file in the background and create the PV items once it is loaded
+            self._startJob(self._onDataLoaded, read_data_file, file_path)
             
     def onFileOpenParameters(self):
         """
         Handles the "Open Parameters" action. Opens a file dialog to load parameter data.
         """
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open JSON File...", "", "JSON Files (*.json);;All Files (*)")
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open JSON File...", self._lastDirectory("lastOpenParams"), "JSON Files (*.json);;All Files (*)")
         _, file_extension = os.path.splitext(file_path)
         
         # Check if a valid JSON file path is selected
         if file_path and file_extension == ".json":
-            # Read PV parameters from the selected JSON file
-            with open(file_path, 'r') as file:
-                pv_params = json.load(file)
-
-            # Reset the main window before loading new data
-            self.main_window.reset()
+            self._rememberDirectory("lastOpenParams", file_path)
             
-            # Iterate through PV parameters and create PV items
-            for params in pv_params:
-                # Add a new PVItem to the PV editor
-                item = self.main_window.pv_editor.addItem()
-                
-                # Update parameters for the PVItem based on the loaded data
-                item.updateParams(params)
+            # Read PV parameters in the background and create the PV items once they are loaded
+            self._startJob(self._onParamsLoaded, read_params_file, file_path)
     
     def onFileSaveData(self):
         """
         Handles the "Save Data As" action. Opens a file dialog to save data.
         """
-        now = datetime.now()
+        stamp = datetime.now().strftime(FILE_TIMESTAMP_FORMAT)
         file_path, _ = QFileDialog.getSaveFileName(self, 
                                                    "Save Data As...", 
-                                                   f"TDA-data_{now.year}{now.month}{now.day}_{now.hour}{now.minute}{now.second}" + DEFAULT_SAVE_DATA_EXT, 
-                                                   "All Files (*);;JSON Files (*.json);;CSV Files (*.csv)")
+                                                   os.path.join(self._lastDirectory("lastSaveData"), f"TDA-data_{stamp}{DEFAULT_SAVE_DATA_EXT}"), 
+                                                   DATA_FILE_FILTER)
         _, file_extension = os.path.splitext(file_path)
         
         if not file_extension:
             file_extension = DEFAULT_SAVE_DATA_EXT
             
-        # Check if a valid file path with either JSON or CSV extension is selected
-        if file_path and (file_extension == ".json" or file_extension == ".csv"):
+        # Check if a valid file path with an allowed extension is selected
+        if file_path and file_extension in DATA_FILE_EXTS:
+            self._rememberDirectory("lastSaveData", file_path)
+            
             # Initialize an empty dictionary to store data
             d = {}
-            max_num_samples = 0
             
             # Iterate through PV items in the main window
             for item in self.main_window.pv_editor:
@@ -170,54 +397,132 @@ class MenuBar(QMenuBar):
                 if not item.pv:
                     continue
                 
-                # Update the maximum number of samples
-                if len(item.samples) > max_num_samples:
-                    max_num_samples = len(item.samples)
-                
-                # Store sample data and corresponding sample times in the dictionary
-                d[item.params["name"] + SAMPLE_HEADER_EXT] = item.samples
-                d[item.params["name"] + SAMPLE_TIME_HEADER_EXT] = item.sample_times
-            
-            # Fill missing samples with `None` to ensure uniform data structure
-            for name in d.keys():
-                d[name] = [None] * (max_num_samples - len(d[name])) + d[name]
-            
-            # Create a DataFrame from the dictionary
-            df = DataFrame(d)
-            
-            # Save the DataFrame to the selected file path based on the file extension
-            if file_extension == ".json":
-                df.to_json(file_path, orient="records")
-            else:
-                df.to_csv(file_path, index=False)
+                # Copy sample data and corresponding sample times so sampling can continue while the file is written
+                name = item.params["name"]
+                d[f"{name}{SAMPLE_HEADER_EXT}"] = item.samples.copy()
+                d[f"{name}{SAMPLE_TIME_HEADER_EXT}"] = item.sample_times.copy()
             
+            # Write the file in the background
+            self._startJob(None, write_data_file, file_path, d)
+                
     def onFileSaveParameters(self):
         """
         Handles the "Save Parameters As" action. Opens a file dialog to save parameter data.
         """
-        now = datetime.now()
+        stamp = datetime.now().strftime(FILE_TIMESTAMP_FORMAT)
         file_path, _ = QFileDialog.getSaveFileName(self,
                                                    "Save JSON File As...",
-                                                   f"TDA-params_{now.year}{now.month}{now.day}_{now.hour}{now.minute}{now.second}" + DEFAULT_SAVE_PARAMS_EXT,
+                                                   os.path.join(self._lastDirectory("lastSaveParams"), f"TDA-params_{stamp}{DEFAULT_SAVE_PARAMS_EXT}"),
                                                    "JSON Files (*.json);;All Files (*)")
         _, file_extension = os.path.splitext(file_path)
     
         if not file_extension:
                 file_extension = DEFAULT_SAVE_PARAMS_EXT
             
-        # Check if a valid file path with a JSON extension is selected
+        # Check if a valid JSON file path with a JSON extension is selected
         if file_path and file_extension == ".json":
+            self._rememberDirectory("lastSaveParams", file_path)
+            
             # Extract PV parameters from PV items in the main window
             params = [item.params for item in self.main_window.pv_editor]
             
-            # Convert the parameters to JSON format with indentation
-            json_data = json.dumps(params, indent=4)
+            # Serialize the parameters here (they may change once control returns to the GUI) and write them in the
+            # background
+            self._startJob(None, write_bytes, file_path, dumps_json(params, indent=True))
+
+    def _startJob(self, slot, func, *args):
+        """
+        Runs a file I/O function on the thread pool. Errors are shown in a critical dialog.
+
+        Args:
+            slot: Called on the GUI thread with the function's return value, or None to ignore it.
+            func: The function to run.
+            *args: Positional arguments for the function.
+        """
+        job = FileJob(func, *args)
+        
+        # Keep the job (and its signals) alive until it reports back; the signals are emitted on the pool's thread, so
+        # they are explicitly queued to the GUI thread
+        queued = Qt.ConnectionType.QueuedConnection
+        self._jobs.add(job)
+        job.signals.finished.connect(lambda _: self._jobs.discard(job), queued)
+        job.signals.failed.connect(lambda _: self._jobs.discard(job), queued)
+        
+        if slot is not None:
+            job.signals.finished.connect(slot, queued)
+        job.signals.failed.connect(lambda error_message: CriticalDialog(error_message, self).exec(), queued)
+        
+        self._thread_pool.start(job)
+        
+    def _onDataLoaded(self, pairs: dict):
+        """
+        Creates PV items from loaded data.
 
-            # Write the JSON data to the selected file path
-            with open(file_path, 'w') as file:
-                file.write(json_data)
+        Args:
+            pairs (dict): {name: [samples, sample_times]} as returned by `read_data_file`.
+        """
+        # Reset the main window before loading new data
+        self.main_window.reset()
+        
+        # Iterate through the pairs and create PV items, repainting the PV editor once and connecting their PVs
+        # together at the end
+        with self.main_window.pv_editor.batchUpdates() as pv_editor, connection_queue():
+            for name, (samples, sample_times) in pairs.items():
+                # Add a new PVItem to the PV editor
+                item = pv_editor.addItem()
+                
+                # Set sample and time data for the PVItem
+                item.setSamples(samples, sample_times)
+                
+                # Update parameters for the PVItem
+                item.updateParams({"name": name})
+                
+    def _onParamsLoaded(self, pv_params: list):
+        """
+        Creates PV items from loaded parameters.
+
+        Args:
+            pv_params (list): The parameters of each PV item.
+        """
+        # Reset the main window before loading new data
+        self.main_window.reset()
+        
+        # Iterate through PV parameters and create PV items, repainting the PV editor once and connecting their PVs
+        # together at the end
+        with self.main_window.pv_editor.batchUpdates() as pv_editor, connection_queue():
+            for params in pv_params:
+                # Add a new PVItem to the PV editor
+                item = pv_editor.addItem()
+                
+                # Update parameters for the PVItem based on the loaded data
+                item.updateParams(params)
 
     def onClearAction(self):
-        for item in self.main_window.pv_editor:
-            item.clearSamples()
-            self.main_window.pv_editor.updated.emit()
+        """
+        Handles the "Clear Sample Histories" action. Clears the samples of every PV item and notifies listeners once.
+        """
+        with self.main_window.pv_editor.batchUpdates() as pv_editor:
+            for item in pv_editor:
+                item.clearSamples()
+
+    def _lastDirectory(self, key: str) -> str:
+        """
+        Returns the directory last used by a file dialog action.
+
+        Args:
+            key (str): The settings key of the file dialog action.
+
+        Returns:
+            str: The last-used directory, or an empty string if there is none.
+        """
+        return self._settings.value(key, "", type=str)
+    
+    def _rememberDirectory(self, key: str, file_path: str):
+        """
+        Stores the directory of a path chosen in a file dialog action.
+
+        Args:
+            key (str): The settings key of the file dialog action.
+            file_path (str): The chosen file path.
+        """
+        self._settings.setValue(key, os.path.dirname(file_path))
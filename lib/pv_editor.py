@@ -1,8 +1,11 @@
+from collections import Counter
+from contextlib import contextmanager
+
 from PyQt6.QtWidgets import QGroupBox, QPushButton, QVBoxLayout, QTableWidget, QHeaderView, QMenu
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QAction
 
-from lib.pv_item import PVItem
+from lib.pv_item import PVItem, SECTION_EXTENSIONS
 
 # Constants for the PV Editor
 GROUPBOX_TEXT = "PV Editor"
@@ -18,10 +21,6 @@ TABLE_ROW_HEIGHT = 50
 DEFAULT_ITEM_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", 
                        "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
 
-RW_NAME = lambda name: name + " Rolling-Window"
-EWM_NAME = lambda name: name + " Exponentially Weighted"
-AA_NAME = lambda name: name + " Adaptive Average"
-
 
 class PVEditor(QGroupBox):
     """
@@ -29,11 +28,16 @@ class PVEditor(QGroupBox):
 
     Attributes:
         main_window: Reference to the main window.
+        _items: PV items in row order, kept in sync with the table.
+        _by_name: PV items by their PV name.
 
     Methods:
         __init__: Initializes the PVEditor with necessary components.
         __iter__: Iterates over PV items in the editor.
         reset: Clears all items from the editor.
+        itemByName: Returns the PV item with the given name.
+        setItemName: Records the new name of a PV item.
+        batchUpdates: Context manager that defers repaints and the 'updated' signal during bulk changes.
         _showTableContextMenu: Shows the context menu when right-clicking on a table row.
         addItem: Adds a new PV item to the editor.
         _onItemParamsUpdated: Handles updates to PV item parameters.
@@ -50,6 +54,8 @@ class PVEditor(QGroupBox):
         super().__init__(GROUPBOX_TEXT)
         
         self.main_window = main_window
+        self._items = []
+        self._by_name = {}
         
         # Add button for adding new PV items
         self.add_button = QPushButton(ADD_BUTTON_TEXT)
@@ -78,14 +84,59 @@ class PVEditor(QGroupBox):
         """
         Allows iterating over PV items in the editor.
         """
-        for row in range(self.table.rowCount()):
-            yield self.table.cellWidget(row, 0)
+        return iter(self._items)
     
     def reset(self):
         """
         Clears all items from the editor.
         """
+        for item in self._items:
+            item.releasePV()
         self.table.setRowCount(0)
+        self._items.clear()
+        self._by_name.clear()
+        
+    def itemByName(self, name: str):
+        """
+        Returns the PV item with the given name.
+
+        Args:
+            name (str): The PV name.
+
+        Returns:
+            PVItem: The PV item, or None if no item has that name.
+        """
+        return self._by_name.get(name)
+    
+    def setItemName(self, item: PVItem, name: str):
+        """
+        Records the new name of a PV item. Called by the item before its 'name' parameter changes.
+
+        Args:
+            item (PVItem): The renamed PV item.
+            name (str): The new PV name, or None to forget the item's name.
+        """
+        self._by_name.pop(item.params["name"], None)
+        if name is not None:
+            self._by_name[name] = item
+        
+    @contextmanager
+    def batchUpdates(self):
+        """
+        Context manager that defers table repaints and the 'updated' signal during bulk changes (e.g. loading a file).
+        The table is repainted and 'updated' is emitted once on exit.
+        """
+        self.table.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            yield self
+        finally:
+            # Deliver the items' pending paramsChanged signals while 'updated' is still blocked
+            for item in self._items:
+                item.flushParamsChanged()
+            self.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+            self.updated.emit()
         
     def _showTableContextMenu(self, pos):
         """
@@ -95,12 +146,20 @@ class PVEditor(QGroupBox):
             pos: Position of the right-click.
         """
         def deleteScript():
-            self.table.removeRow(self.table.rowAt(pos.y()))
+            row = self.table.rowAt(pos.y())
+            if row < 0:
+                return
+            self.table.removeRow(row)
+            item = self._items.pop(row)
+            item.releasePV()
+            self._by_name.pop(item.params["name"], None)
             self.updated.emit()
             
         def clearHistory():
             row = self.table.rowAt(pos.y())
-            item = self.table.cellWidget(row, 0)
+            if row < 0:
+                return
+            item = self._items[row]
             item.clearSamples()
             self.updated.emit()
             
@@ -120,32 +179,16 @@ class PVEditor(QGroupBox):
         """
         Adds a new PV item to the editor.
 
-        The method is responsible for creating and adding a new PVItem to the editor's table. It ensures that each PV item
-        has a unique color and connects the item's 'paramsChanged' signal to the '_onItemParamsUpdated' slot.
+        The method is responsible for creating and adding a new PVItem to the editor's table. It assigns each PV item the
+        least-used default color (the earliest one on ties) and connects the item's 'paramsChanged' signal to the
+        '_onItemParamsUpdated' slot.
 
         Returns:
             PVItem: The newly created PV item.
         """
-        # List to track unavailable colors
-        unavailable_colors = []
-        
-        # Iterate through existing rows in the table to check colors
-        for row in range(self.table.rowCount()):
-            item = self.table.cellWidget(row, 0)
-            if item:
-                color = item.params.get("color", "")
-                if color in DEFAULT_ITEM_COLORS:
-                    unavailable_colors.append(color)
-                    
-                    # If all default colors are unavailable, clear the list to start fresh
-                    if set(unavailable_colors) == set(DEFAULT_ITEM_COLORS):
-                        unavailable_colors.clear()
-        
-        # Find the first available color from the default set
-        for tab_color in DEFAULT_ITEM_COLORS:
-            if tab_color not in unavailable_colors:
-                color = tab_color
-                break
+        # Count the colors in use in a single pass and pick the least-used default color
+        color_counts = Counter(item.params.get("color", "") for item in self)
+        color = min(DEFAULT_ITEM_COLORS, key=color_counts.__getitem__)
         
         # Create a new PVItem instance
         item = PVItem(self)
@@ -155,6 +198,7 @@ class PVEditor(QGroupBox):
         self.table.insertRow(new_row)
         self.table.setCellWidget(new_row, 0, item)
         self.table.setRowHeight(new_row, TABLE_ROW_HEIGHT)
+        self._items.append(item)
         
         # Update the parameters of the new item with the selected color
         item.updateParams({"color": color})
@@ -172,22 +216,16 @@ class PVEditor(QGroupBox):
         Args:
             params: Updated parameters of the PV item.
         """
+        name = params["name"]
+        if name is None:  # unnamed items (e.g. the color set by addItem) have no curves yet
+            return
         kwargs = params.get("kwargs", {})
-        og_kwargs = kwargs.get("original", {})
-        rw_kwargs = kwargs.get("rolling_window", {})
-        ewm_kwargs = kwargs.get("ewm", {})
-        aa_kwargs = kwargs.get("adaptive", {})
+        canvas = self.main_window.canvas
         
-        if self.main_window.canvas.isCurve(params["name"]) and not og_kwargs.get("enabled", False):
-            self.main_window.canvas.removeCurve(params["name"])
-            
-        if self.main_window.canvas.isCurve(RW_NAME(params["name"])) and not rw_kwargs.get("enabled", False):
-            self.main_window.canvas.removeCurve(RW_NAME(params["name"]))
-            
-        if self.main_window.canvas.isCurve(EWM_NAME(params["name"])) and not ewm_kwargs.get("enabled", False):
-            self.main_window.canvas.removeCurve(EWM_NAME(params["name"]))
-            
-        if self.main_window.canvas.isCurve(AA_NAME(params["name"])) and not aa_kwargs.get("enabled", False):
-            self.main_window.canvas.removeCurve(AA_NAME(params["name"]))
+        # Remove the curve of every disabled kwargs section
+        for section, extension in SECTION_EXTENSIONS.items():
+            label = name + extension
+            if canvas.isCurve(label) and not kwargs.get(section, {}).get("enabled", False):
+                canvas.removeCurve(label)
 
         self.updated.emit()
\ No newline at end of file
@@ -1,12 +1,18 @@
+import math
 import os
-from copy import deepcopy
+from collections import deque, namedtuple
+from contextlib import ExitStack, contextmanager
 from time import time
 
+import numpy as np
+import pandas as pd
 from PyQt6.QtWidgets import (QWidget, QDoubleSpinBox, QComboBox, QRadioButton, QPushButton, 
                              QDialog, QSpinBox, QLabel, QColorDialog, QLineEdit, QMessageBox,
                              QTreeWidget, QTreeWidgetItem, QCheckBox, QHBoxLayout, QGridLayout, QSizePolicy)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QRunnable, QSignalBlocker, QThreadPool, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QIcon, QColor, QFontMetrics
+from PyQt6 import sip
+from pyqtgraph import SignalProxy
 
 from epics import PV
 
@@ -24,6 +30,41 @@ DEFAULT_KWARGS = {"original": {'enabled': True},
                   "rolling_window": {'enabled': False, 'window': 1, 'center': False, 'closed': 'right'},
                   "ewm": {'enabled': False, 'com': 0.0, 'span': None, 'halflife': None, 'alpha': None, 'adjust': False},
                   "adaptive": {'enabled': False, 'phase_threshold': 0.5, 'n_avg': 8}}
+CLOSED_VALUES = ("right", "left", "both", "neither")  # rolling window `closed` values, in combo box order
+CLOSED_INDICES = {value: index for index, value in enumerate(CLOSED_VALUES)}
+# KwargTree layout: [(section, title, [(key, label, label tool tip, widget factory, {widget setter: value})])]
+KWARG_TREE_SPEC = [
+    ("original", "Original", [
+        ("enabled", "Enable", None, QCheckBox, {"setChecked": True})]),
+    ("rolling_window", "Rolling Window", [
+        ("enabled", "Enable", None, QCheckBox, {}),
+        ("window", "Window", "Size of the moving window.",
+         QSpinBox, {"setAlignment": SPINBOX_ALIGNMENT, "setMinimum": 1, "setToolTip": "≥1"}),
+        ("center", "Center", "True: Set the window labels as the center of the window index.\nFalse: Set the window labels as the right edge of the window index.",
+         QCheckBox, {}),
+        ("closed", "Closed", "Right: The first point in the window is excluded from calculations.\nLeft: The last point in the window is excluded from calculations.\nBoth: No points in the window are excluded from calculations.\nNeither: The first and last points in the window are excluded from calcuations.",
+         QComboBox, {"addItems": [value.capitalize() for value in CLOSED_VALUES]})]),
+    ("ewm", "Exponentially Weighted", [
+        ("enabled", "Enable", None, QCheckBox, {}),
+        ("com", "Com", "Specify decay in terms of center mass.",
+         lambda: OptionalDoubleSpinBox(0, step=0.25), {"setToolTip": "a = 1/(1+com), for com ≥ 0"}),
+        ("span", "Span", "Specify decay in terms of span.",
+         lambda: OptionalDoubleSpinBox(1, step=0.25, comparator=lambda val: 1 <= val <= float("Inf")),
+         {"setToolTip": "a = 2/(span+1), for span ≥ 1"}),
+        ("halflife", "Half-Life", "Specify decay in terms of half-life.",
+         lambda: OptionalDoubleSpinBox(0.25, step=0.25, comparator=lambda val: 0 < val <= float("Inf")),
+         {"setToolTip": "a = 1-exp(-ln(2)/halflife), for halflife > 0"}),
+        ("alpha", "Alpha", "Specify smoothing factor `a` directly.",
+         lambda: OptionalDoubleSpinBox(0.1, step=0.1, comparator=lambda val: 0 < val <= 1), {"setToolTip": "0<a≤1"}),
+        ("adjust", "Adjust", "True: Calculate using weights\nFalse: Calculate using recursion", QCheckBox, {})]),
+    ("adaptive", "Adaptive Average", [
+        ("enabled", "Enable", None, QCheckBox, {}),
+        ("phase_threshold", "Phase Threshold", None,
+         QDoubleSpinBox, {"setValue": 0.5, "setSingleStep": 0.25, "setToolTip": "The phase change threshold to disable averaging."}),
+        ("n_avg", "Number of Points", None,
+         QSpinBox, {"setAlignment": SPINBOX_ALIGNMENT, "setMinimum": 1, "setValue": 8, "setToolTip": "Number of points to consider in calculations."})]),
+]
+EWM_DECAY_KEYS = ("com", "span", "halflife", "alpha")  # mutually exclusive; the first is selected initially
 DIALOG_WIDTH = 350
 DIALOG_MODALITY = False
 DIALOG_ICON_FILENAME = os.path.join(os.getcwd(), "resources", "images", "frib.png")
@@ -31,6 +72,124 @@ PV_VALUE_LABEL_TEXT_SIZE = 8
 PV_VALUE_LABEL_GEOMETRY = (220, -1, 15)  # (x, y, height)
 PARAM_BUTTON_WIDTH = 100
 COLOR_SQUARE_WIDTH = 50
+PV_FORM = "native"  # plain values; no time/control metadata
+PV_MONITOR_MASK = 1  # epics.dbr.DBE_VALUE: monitor value changes only, not alarm/property events
+PARAMS_CHANGED_DELAY = 50  # ms; parameter changes within this window are reported by one paramsChanged emission
+SPINBOX_RATE_LIMIT = 60  # max. validations of optional spin box edits per second
+SECTION_EXTENSIONS = {"original": "", "rolling_window": " Rolling-Window", "ewm": " Exponentially Weighted",
+                      "adaptive": " Adaptive Average"}  # {kwargs section: curve name extension}
+CALCULATED_SECTIONS = ("rolling_window", "ewm", "adaptive")  # kwargs sections computed by the calculator
+SAMPLE_CAPACITY = 1 << 16  # samples kept per PV; once full, the oldest are overwritten
+
+
+# What to draw for an item per tick, baked from its kwargs whenever they change: the original data, the streamed rolling
+# mean and EWM, and whether the calculator has anything to compute
+RenderSpec = namedtuple("RenderSpec", ["original", "streamed_rolling_window", "streamed_ewm", "calculated"])
+
+
+def _default_kwargs() -> dict:
+    """
+    Returns a fresh copy of `DEFAULT_KWARGS`, so items never share (and mutate) the same section dicts.
+    """
+    return {section: dict(kwargs) for section, kwargs in DEFAULT_KWARGS.items()}
+
+
+def _calculation_kwargs(kwargs: dict) -> dict:
+    """
+    Returns the keyword arguments of each enabled calculation without their 'enabled' key, ready to be passed on as
+    they are; disabled (or missing) sections map to None.
+    """
+    return {section: {key: value for key, value in kwargs.get(section, {}).items() if key != "enabled"}
+            if kwargs.get(section, {}).get("enabled", False) else None
+            for section in CALCULATED_SECTIONS}
+
+
+def _streamed_window(rw_kwargs: dict):
+    """
+    Returns the window size if the rolling window kwargs describe a trailing (right-aligned, right-closed) fixed window,
+    whose mean can be updated per sample in O(1), or None if the calculator has to compute it.
+    """
+    if rw_kwargs is None or set(rw_kwargs) - {"window", "center", "closed"}:
+        return None
+    window = rw_kwargs.get("window")
+    if rw_kwargs.get("center", False) or rw_kwargs.get("closed", "right") not in ("right", None):
+        return None
+    if not isinstance(window, int) or not 1 <= window < SAMPLE_CAPACITY:
+        return None
+    return window
+
+
+def _streamed_ewm(ewm_kwargs: dict):
+    """
+    Returns the (decay factor, weight of a new observation, adjust) of an exponentially weighted mean with a single
+    decay parameter, which can be updated per sample in O(1) with pandas' recursion, or None if the calculator has to
+    compute it.
+    """
+    if ewm_kwargs is None or set(ewm_kwargs) - {*EWM_DECAY_KEYS, "adjust"}:
+        return None
+    decays = [(key, ewm_kwargs[key]) for key in EWM_DECAY_KEYS if ewm_kwargs.get(key) is not None]
+    if len(decays) != 1:
+        return None
+    
+    # Convert the decay parameter to the smoothing factor like pandas does
+    key, value = decays[0]
+    if key == "com" and value >= 0:
+        alpha = 1 / (1 + value)
+    elif key == "span" and value >= 1:
+        alpha = 2 / (value + 1)
+    elif key == "halflife" and value > 0:
+        alpha = 1 - math.exp(math.log(0.5) / value)
+    elif key == "alpha" and 0 < value <= 1:
+        alpha = value
+    else:
+        return None
+    adjust = bool(ewm_kwargs.get("adjust", True))
+    return 1 - alpha, 1.0 if adjust else alpha, adjust
+
+
+_DIALOG_ICON = None  # loaded on first use, as a QIcon needs a running application
+
+
+def _dialog_icon() -> QIcon:
+    """
+    Returns the parameter dialog icon, loading it from disk only once.
+    """
+    global _DIALOG_ICON
+    if _DIALOG_ICON is None:
+        _DIALOG_ICON = QIcon(DIALOG_ICON_FILENAME)
+    return _DIALOG_ICON
+
+
+# PV connections deferred by `connection_queue` ({item: (name, name before the block)}), or None when connections are made
+# immediately
+_pending_connections = None
+
+
+@contextmanager
+def connection_queue():
+    """
+    Defers the PV connections requested inside the block and makes them together on exit, so the channel searches of
+    many PVs overlap instead of running one after another. Nested blocks are connected by the outermost one. An item
+    whose PV fails to connect gets back the name (and PV) it had before the block.
+    """
+    global _pending_connections
+    if _pending_connections is not None:
+        yield
+        return
+    
+    _pending_connections = {}
+    try:
+        yield
+    finally:
+        pending, _pending_connections = _pending_connections, None
+        
+        # Create every PV before any of them is read
+        for item, (name, previous_name) in pending.items():
+            try:
+                item._connectPV(name)
+            except Exception as exc:
+                item._revertName(previous_name)
+                item._showError(str(exc))
 
 
 class PVItem(QWidget):
@@ -39,25 +198,54 @@ class PVItem(QWidget):
 
     Methods:
         updateParams: Update the PV parameters and trigger a signal for changes.
+        _revertName: Restore the PV name after a deferred connection failed.
+        _showChildren: Show or hide the widgets of a named item.
+        flushParamsChanged: Emit a pending paramsChanged signal right away.
+        _emitParamsChanged: Emit the paramsChanged signal.
+        _showError: Show an error message in the item's critical dialog.
+        _onLineEditReturn: Apply the PV name entered in the line edit.
         _showParamDialog: Show the parameter dialog for the PV.
         _onApplyParams: Apply the changes made in the parameter dialog.
+        _applyKwargs: Rebuild the calculator kwargs, the render spec, and the streamed means.
+        recent: Return views of the most recent samples and their sample times.
+        rollingMean: Return a view of the most recent streamed rolling means.
+        ewmMean: Return a view of the most recent streamed exponentially weighted means.
+        calcKwargs: Return the calculator kwargs for the most recent samples.
+        _isLimited: Return whether the most recent samples leave older samples out.
+        _recentSlice: Return the ring buffer slice of the most recent samples.
         sample: Sample the current value of the PV.
+        releasePV: Stop receiving value updates from the PV.
+        _connectPV: Replace the PV with a monitored one.
+        _onMonitor: Queue a PV value update for the next sample.
+        setSamples: Replace the sampled values and their sample times.
+        clearSamples: Clear the sampled values and their sample times.
+        _allocateSamples: Allocate empty sample ring buffers.
+        _resetRollingMean: Recompute the streamed rolling mean from the samples.
+        _updateRollingMean: Advance the streamed rolling mean by one sample.
+        _resetEWMMean: Recompute the streamed exponentially weighted mean from the samples.
+        _updateEWMMean: Advance the streamed exponentially weighted mean by one sample.
+        _fillRing: Store values for all samples in a ring buffer.
 
     Signals:
-        paramsChanged: Signal emitted when the PV parameters are changed.
+        paramsChanged: Signal emitted when the PV parameters are changed (once per burst of changes).
 
     Attributes:
         pv_editor: Reference to the parent PV editor.
         pv: The PV object associated with this widget.
         params: Dictionary containing PV parameters (name, color, subplot_id, kwargs).
-        samples: List of sampled values from the PV.
-        sample_times: List of corresponding sample times.
+        curve_labels: Dictionary of the canvas curve label per kwargs section, rebuilt when the name changes.
+        calc_kwargs: Calculator-ready kwargs per calculated section (None if disabled or streamed by the item itself),
+            rebuilt when kwargs change. See calcKwargs for the kwargs of a limited number of samples.
+        render_spec: RenderSpec of the curves to draw, rebuilt when kwargs change.
+        samples: Array of sampled values from the PV, oldest first (view of the sample ring buffer).
+        sample_times: Array of corresponding sample times (view of the sample time ring buffer).
+        sample_version: Counter bumped whenever the samples change, so results computed from them can be reused.
 
     Widgets:
         line_edit: QLineEdit for editing the PV name.
         color_square: PaletteButton for selecting the color of the PV curve.
         param_button: QPushButton for opening the parameter dialog.
-        param_dialog: ParameterDialog for configuring advanced PV settings.
+        param_dialog: ParameterDialog for configuring advanced PV settings (created on first use).
 
     Layout:
         The widget has a QHBoxLayout to arrange its child widgets.
@@ -77,13 +265,28 @@ class PVItem(QWidget):
         
         # Initialize PV-related attributes
         self.pv = None
+        self._latest_value = None  # most recent monitored value, None until the first update arrives
+        self._pending_values = deque(maxlen=1)  # newest value not yet taken by sample(); appended from the CA thread
+        self._read_pending = False  # whether a background read of the PV is waiting for its value
+        self._error_dialog = None  # created on the first error and reused afterwards
+        
+        # Coalesce bursts of parameter changes into a single paramsChanged emission
+        self._params_changed_timer = QTimer(self)
+        self._params_changed_timer.setSingleShot(True)
+        self._params_changed_timer.setInterval(PARAMS_CHANGED_DELAY)
+        self._params_changed_timer.timeout.connect(self._emitParamsChanged, Qt.ConnectionType.DirectConnection)
         self.params = {"name": None,
                        "color": DEFAULT_COLOR,
                        "subplot_id": DEFAULT_SUBPLOT_ID,
-                       "kwargs": DEFAULT_KWARGS}
+                       "kwargs": _default_kwargs()}
+        self.curve_labels = {}
         
-        self.samples = []
-        self.sample_times = []
+        # Fixed-capacity float64 ring buffers
+        self.sample_version = 0
+        self._rolling_window = None  # window of the streamed rolling mean, None if the calculator computes it
+        self._ewm_weights = None  # (decay, new weight, adjust) of the streamed EWM, None if the calculator computes it
+        self._allocateSamples(SAMPLE_CAPACITY)
+        self._applyKwargs()
         
         self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.setContentsMargins(0, 0, 0, 0)
@@ -92,8 +295,8 @@ class PVItem(QWidget):
         self.line_edit = QLineEdit("")
         self.line_edit.setPlaceholderText(PV_LABEL_PLACEHOLDER)
         self.line_edit.setAlignment(PV_LABEL_ALIGNMENT)
-        self.line_edit.returnPressed.connect(self.line_edit.clearFocus)
-        self.line_edit.returnPressed.connect(lambda: self.updateParams({"name": self.line_edit.text()}))
+        self.line_edit.returnPressed.connect(self.line_edit.clearFocus, Qt.ConnectionType.DirectConnection)
+        self.line_edit.returnPressed.connect(self._onLineEditReturn, Qt.ConnectionType.DirectConnection)
         
         # Set up PV color selection
         self.color_square = PaletteButton()
@@ -102,11 +305,9 @@ class PVItem(QWidget):
         
         # Set up PV parameter dialog
         self.param_button = QPushButton(PV_PARAM_BUTTON_LABEL)
-        self.param_button.pressed.connect(self._showParamDialog)
+        self.param_button.pressed.connect(self._showParamDialog, Qt.ConnectionType.DirectConnection)
         self.param_button.setFixedWidth(PARAM_BUTTON_WIDTH)
-        self.param_dialog = ParameterDialog()
-        self.param_dialog.apply_button.pressed.connect(self._onApplyParams)
-        self.param_dialog.apply_ok_button.pressed.connect(self._onApplyParams)
+        self._param_dialog = None  # most dialogs are never opened, so each is built on first use
         
         # Set up PV value display
         self.value_display = QLabel("", self)
@@ -115,7 +316,15 @@ class PVItem(QWidget):
         self.value_display.setFont(font)
         self.value_display.setVisible(False)
         
-        # Set up layout
+        # Measure the value text with cached font metrics; digits share one advance, so widths are cached per length
+        self._font_metrics = QFontMetrics(font)
+        self._text_widths = {}
+        self._last_text_geometry = None  # (x, width) of the label
+        self._last_text = ""
+        
+        # Set up layout (the color square and parameter button are added once a PV name is set)
+        self._children_added = False
+        self._children_shown = False
         layout = QHBoxLayout()
         layout.setAlignment(ITEM_LAYOUT_ALIGNMENT)
         layout.addWidget(self.line_edit)
@@ -123,7 +332,8 @@ class PVItem(QWidget):
         
     def updateParams(self, params: dict = {}):
         """
-        Update the PV parameters and trigger a signal for changes.
+        Update the PV parameters and trigger a signal for changes. Parameters equal to the current ones are ignored, and
+        nothing is emitted if none of them changed.
 
         Args:
             params (dict): Dictionary containing PV parameters to update.
@@ -132,87 +342,532 @@ class PVItem(QWidget):
             ValueError: Raised if the new PV name already exists in the PV editor.
 
         Signals:
-            paramsChanged: Signal emitted when the PV parameters are changed.
+            paramsChanged: Signal emitted when the PV parameters are changed, after `PARAMS_CHANGED_DELAY` ms without
+                           further changes.
         """
+        # Keep only the parameters that differ from the current ones
+        params = {key: value for key, value in params.items() if self.params.get(key) != value}
+        if not params:
+            return
+        
         try:
             # Check if the PV name has changed
             if params.get("name", "") and params["name"] != self.params["name"]:
                 # Verify the name isn't already taken
-                for item in self.pv_editor:
-                    if item is not self and item.params["name"] == params["name"]:
-                        self.line_edit.setFocus()
-                        self.line_edit.setText(self.params["name"] if self.params["name"] is not None else "")
-                        raise ValueError(f"'{params['name']}' already exists...")
+                other = self.pv_editor.itemByName(params["name"])
+                if other is not None and other is not self:
+                    self.line_edit.setFocus()
+                    self.line_edit.setText(self.params["name"] if self.params["name"] is not None else "")
+                    raise ValueError(f"'{params['name']}' already exists...")
                 
-                # Update the PV object with the new name
-                self.pv = PV(params["name"])
+                # Replace the PV object with a monitored one for the new name (deferred inside a `connection_queue`)
+                if _pending_connections is not None:
+                    previous_name = _pending_connections[self][1] if self in _pending_connections else self.params["name"]
+                    _pending_connections[self] = (params["name"], previous_name)
+                else:
+                    self._connectPV(params["name"])
+                self.pv_editor.setItemName(self, params["name"])
+                self.curve_labels = {section: params["name"] + extension for section, extension in SECTION_EXTENSIONS.items()}
                 self.line_edit.setText(params["name"])
             
             # Update the PV parameters
             self.params.update(params)
+            if "kwargs" in params:
+                self._applyKwargs()
             
-            # Check if the PV name is set and only the line edit is showing
-            name_was_set = "name" in self.params.keys() and self.params["name"] is not None
-            only_line_edit_showing = self.layout().indexOf(self.color_square) == -1 and self.layout().indexOf(self.param_button) == -1
-            if name_was_set and only_line_edit_showing:
-                self.value_display.setVisible(True)
-                self.layout().addWidget(self.color_square)
-                self.layout().addWidget(self.param_button)
+            # Show the other widgets once the PV name is set (only the line edit is showing before)
+            self._showChildren(self.params["name"] is not None)
                 
-                
-            # Update the color square and parameter dialog
+            # Update the color square and parameter dialog (if it exists yet)
             self.color_square.setColor(self.params["color"])
-            self.param_dialog.updateParams(self.params)
+            if self._param_dialog is not None:
+                self._param_dialog.updateParams(self.params)
             
-            # Emit the paramsChanged signal
-            self.paramsChanged.emit(self.params)
+            # (Re)start the paramsChanged countdown
+            self._params_changed_timer.start()
             
         except Exception as exc:
             # Display a critical dialog in case of an exception
-            critical_dialog = CriticalDialog(str(exc), self)
-            critical_dialog.exec()
+            self._showError(str(exc))
+        
+    def flushParamsChanged(self):
+        """
+        Emits a pending paramsChanged signal right away instead of after the delay.
+        """
+        if self._params_changed_timer.isActive():
+            self._params_changed_timer.stop()
+            self._emitParamsChanged()
+            
+    @pyqtSlot()
+    def _emitParamsChanged(self):
+        """
+        Emits the paramsChanged signal with the current parameters.
+        """
+        self.paramsChanged.emit(self.params)
+        
+    def _showError(self, error_message: str):
+        """
+        Shows an error message in the item's critical dialog.
+
+        Args:
+            error_message (str): The error message to be displayed.
+        """
+        if self._error_dialog is None:
+            self._error_dialog = CriticalDialog(error_message, self)
+        else:
+            self._error_dialog.setMessage(error_message)
+        self._error_dialog.exec()
+        
+    def _revertName(self, name: str):
+        """
+        Restores the PV name the item had before a deferred connection to its new name failed. Its PV was not replaced.
+
+        Args:
+            name (str): The previous PV name (None if the item had none).
+        """
+        self.pv_editor.setItemName(self, name)
+        self.params["name"] = name
+        self.curve_labels = ({section: name + extension for section, extension in SECTION_EXTENSIONS.items()}
+                             if name is not None else {})
+        self.line_edit.setText(name if name is not None else "")
+        self._showChildren(name is not None)
+        if self._param_dialog is not None:
+            self._param_dialog.updateParams(self.params)
+        self._params_changed_timer.start()
         
+    def _showChildren(self, visible: bool):
+        """
+        Shows or hides the widgets of a named item (the value display, color square, and parameter button).
+
+        Args:
+            visible (bool): Whether to show them.
+        """
+        if visible == self._children_shown:
+            return
+        if not self._children_added:
+            layout = self.layout()
+            layout.addWidget(self.color_square)
+            layout.addWidget(self.param_button)
+            self._children_added = True
+        for widget in (self.value_display, self.color_square, self.param_button):
+            widget.setVisible(visible)
+        self._children_shown = visible
+        
+    @pyqtSlot()
+    def _onLineEditReturn(self):
+        """
+        Applies the PV name entered in the line edit.
+        """
+        self.updateParams({"name": self.line_edit.text()})
+        
+    @property
+    def param_dialog(self) -> "ParameterDialog":
+        """
+        Returns the parameter dialog, creating it in sync with the current parameters on first use.
+        """
+        if self._param_dialog is None:
+            self._param_dialog = ParameterDialog()
+            self._param_dialog.apply_button.pressed.connect(self._onApplyParams, Qt.ConnectionType.DirectConnection)
+            self._param_dialog.apply_ok_button.pressed.connect(self._onApplyParams, Qt.ConnectionType.DirectConnection)
+            self._param_dialog.updateParams(self.params)
+        return self._param_dialog
+        
+    @pyqtSlot()
     def _showParamDialog(self):
         """
-        Shows the parameter dialog for the PV item.
+        Shows the parameter dialog for the PV item (non-modal, so plotting continues behind it). A dialog that is already
+        open is brought to the front instead of staying hidden behind the main window.
         """
         self.param_dialog.updateParams(self.params)
         self.param_dialog.show()
+        self.param_dialog.raise_()
+        self.param_dialog.activateWindow()
         
+    @pyqtSlot()
     def _onApplyParams(self):
         """
         Applies the changes made in the parameter dialog.
         """
-        params = self.param_dialog.getParams()
-        self.color_square.setColor(params["color"])
-        self.params.update(params)
+        self.updateParams(self.param_dialog.getParams())
         
-        self.paramsChanged.emit(self.params)
+    def _applyKwargs(self):
+        """
+        Rebuilds the calculator kwargs and the render spec from the kwargs parameter. A trailing rolling mean (the
+        calculator aggregates with the mean) and a single-parameter exponentially weighted mean are streamed by the item
+        itself, so they are left out of the calculator kwargs (the EWM only while all samples are drawn).
+        """
+        calc_kwargs = _calculation_kwargs(self.params["kwargs"])
+        self._rolling_window = _streamed_window(calc_kwargs["rolling_window"])
+        if self._rolling_window is not None:
+            calc_kwargs["rolling_window"] = None
+        self._limited_calc_kwargs = dict(calc_kwargs)  # the calculator computes the EWM of a limited window (see calcKwargs)
+        self._ewm_weights = _streamed_ewm(calc_kwargs["ewm"])
+        if self._ewm_weights is not None:
+            calc_kwargs["ewm"] = None
+        self.calc_kwargs = calc_kwargs  # replaced whole, as snapshots hand it to the calculator thread
+        self.render_spec = RenderSpec(original=self.params["kwargs"].get("original", {}).get("enabled", False),
+                                      streamed_rolling_window=self._rolling_window is not None,
+                                      streamed_ewm=self._ewm_weights is not None,
+                                      calculated=any(kwargs is not None for kwargs in calc_kwargs.values()))
+        self._resetRollingMean()
+        self._resetEWMMean()
+        
+    @property
+    def samples(self) -> np.ndarray:
+        """
+        Returns the sampled PV values.
+        """
+        start = max(self._head - self._capacity, 0) % self._capacity
+        return self._sample_buffer[start:start + min(self._head, self._capacity)]
+    
+    @property
+    def sample_times(self) -> np.ndarray:
+        """
+        Returns the sample times corresponding to the sampled PV values.
+        """
+        start = max(self._head - self._capacity, 0) % self._capacity
+        return self._sample_time_buffer[start:start + min(self._head, self._capacity)]
+        
+    def recent(self, count: int = 0) -> tuple:
+        """
+        Returns the most recent sampled PV values and their sample times as views of the ring buffers (no copies).
+
+        Args:
+            count (int, optional): The number of samples to return. 0 (default) returns all of them.
+
+        Returns:
+            tuple: (samples, sample_times) arrays, oldest first.
+        """
+        recent = self._recentSlice(count)
+        return self._sample_buffer[recent], self._sample_time_buffer[recent]
+    
+    def rollingMean(self, count: int = 0):
+        """
+        Returns the most recent rolling means, aligned with `recent(count)`, as a view of the ring buffer (no copy).
+
+        Args:
+            count (int, optional): The number of rolling means to return. 0 (default) returns all of them.
+
+        Returns:
+            ndarray: The rolling means (NaN until a full window was sampled), or None if the rolling window isn't
+            streamed.
+        """
+        if self._rolling_window is None:
+            return None
+        return self._rolling_mean_buffer[self._recentSlice(count)]
+    
+    def ewmMean(self, count: int = 0):
+        """
+        Returns the most recent exponentially weighted means, aligned with `recent(count)`, as a view of the ring buffer
+        (no copy). The streamed means weigh in every sample, so they are only returned when `count` covers all of them;
+        the EWM of fewer samples is computed by the calculator (see `calcKwargs`).
+
+        Args:
+            count (int, optional): The number of means to return. 0 (default) returns all of them.
+
+        Returns:
+            ndarray: The exponentially weighted means, or None if they aren't streamed or `count` leaves samples out.
+        """
+        if self._ewm_weights is None or self._isLimited(count):
+            return None
+        return self._ewm_mean_buffer[self._recentSlice(count)]
+    
+    def calcKwargs(self, count: int = 0):
+        """
+        Returns the calculator kwargs for the most recent samples.
+
+        Args:
+            count (int, optional): The number of samples calculated over. 0 (default) selects all of them.
+
+        Returns:
+            dict: Calculator-ready kwargs per calculated section (`calc_kwargs`, plus the streamed EWM's if `count` leaves
+            samples out), or None if there is nothing to calculate.
+        """
+        if self._ewm_weights is not None and self._isLimited(count):
+            return self._limited_calc_kwargs
+        return self.calc_kwargs if self.render_spec.calculated else None
+    
+    def _isLimited(self, count: int) -> bool:
+        """
+        Returns whether the most recent `count` samples leave older samples out.
+
+        Args:
+            count (int): The number of samples. 0 selects all of them.
+        """
+        return 0 < count < min(self._head, self._capacity)
+    
+    def _recentSlice(self, count: int) -> slice:
+        """
+        Returns the ring buffer slice holding the most recent samples.
+
+        Args:
+            count (int): The number of samples. 0 selects all of them.
+        """
+        num_samples = min(self._head, self._capacity)
+        end = max(self._head - self._capacity, 0) % self._capacity + num_samples
+        return slice(end - min(count, num_samples) if count else end - num_samples, end)
         
     def sample(self) -> float:
         """
-        Samples the PV value and records sample time.
+        Samples the PV value and records sample time. Takes the newest monitor update queued since the last sample (or
+        keeps the previous value if none arrived); until the first update has arrived, the PV is read on a worker
+        thread instead and nothing is recorded.
 
         Returns:
-            float: Sampled PV value.
+            float: Sampled PV value, or None if no value has arrived yet.
         """
-        sample = self.pv.get()
-        self.sample_times.append(float(time()))
-        self.samples.append(sample)
+        # Drain the monitor updates once per tick; deque.pop is atomic, so no lock is needed against the CA thread
+        try:
+            self._latest_value = self._pending_values.pop()
+            self._read_pending = False
+        except IndexError:
+            pass
         
-        sample_text = "{:.3e}".format(sample)
-        font_metrics = QFontMetrics(self.value_display.font())
-        text_width = font_metrics.horizontalAdvance(sample_text)
+        sample = self._latest_value
+        if sample is None:
+            if not self._read_pending:
+                self._read_pending = True
+                QThreadPool.globalInstance().start(_ReadJob(self, self.pv))
+            return None
         
-        self.value_display.setGeometry(self.line_edit.width() - text_width + 10, PV_VALUE_LABEL_GEOMETRY[1], 
-                                       text_width, PV_VALUE_LABEL_GEOMETRY[2])
-        self.value_display.setText(sample_text)
+        # Write into both halves of the ring buffers, overwriting the oldest sample once they are full
+        index = self._head % self._capacity
+        self._sample_buffer[index] = self._sample_buffer[index + self._capacity] = sample
+        self._sample_time_buffer[index] = self._sample_time_buffer[index + self._capacity] = time()
+        self._head += 1
+        self.sample_version += 1
+        if self._rolling_window is not None:
+            self._updateRollingMean(index, sample)
+        if self._ewm_weights is not None:
+            self._updateEWMMean(index, sample)
+        
+        sample_text = f"{sample:.3e}"
+        text_width = self._text_widths.get(len(sample_text))
+        if text_width is None:
+            text_width = self._text_widths[len(sample_text)] = self._font_metrics.horizontalAdvance(sample_text)
+        
+        # Only move the label and change its text when they differ from the last sample's
+        x = self.line_edit.width() - text_width + 10
+        if (x, text_width) != self._last_text_geometry:
+            self.value_display.setGeometry(x, PV_VALUE_LABEL_GEOMETRY[1], text_width, PV_VALUE_LABEL_GEOMETRY[2])
+            self._last_text_geometry = (x, text_width)
+        if sample_text != self._last_text:
+            self.value_display.setText(sample_text)
+            self._last_text = sample_text
         
         return sample
     
+    def releasePV(self):
+        """
+        Stops receiving value updates from the PV. Called before the PV is replaced or the item is removed.
+        """
+        if self.pv is not None:
+            self.pv.disconnect()
+        self._latest_value = None
+        self._pending_values.clear()
+        self._read_pending = False
+        
+    def _connectPV(self, name: str):
+        """
+        Replaces the PV with a monitored one.
+
+        Args:
+            name (str): Name of the PV.
+        """
+        pv = PV(name, form=PV_FORM, callback=self._onMonitor, auto_monitor=PV_MONITOR_MASK)
+        self.releasePV()
+        self.pv = pv
+        
+    def _onMonitor(self, value=None, **kwargs):
+        """
+        PV monitor callback, called from the CA thread. Queues the value for the next sample; updates arriving between
+        two samples replace each other, as only the newest is sampled.
+
+        Args:
+            value: The updated PV value.
+            **kwargs: Other monitor fields (pvname, timestamp, ...), unused.
+        """
+        if value is not None:
+            self._pending_values.append(float(value))
+    
+    def setSamples(self, samples, sample_times):
+        """
+        Replaces the sampled PV values and their sample times. The ring buffers grow to hold all of them if needed.
+
+        Args:
+            samples (array-like): The sampled PV values.
+            sample_times (array-like): The corresponding sample times.
+        """
+        samples = np.asarray(samples, dtype=np.float64)
+        sample_times = np.asarray(sample_times, dtype=np.float64)
+        num_samples = len(samples)
+        
+        self._allocateSamples(max(SAMPLE_CAPACITY, num_samples))
+        for buffer, values in ((self._sample_buffer, samples), (self._sample_time_buffer, sample_times)):
+            buffer[:num_samples] = buffer[self._capacity:self._capacity + num_samples] = values
+        self._head = num_samples
+        self.sample_version += 1
+        self._resetRollingMean()
+        self._resetEWMMean()
+    
     def clearSamples(self):
-        self.samples.clear()
-        self.sample_times.clear()
+        """
+        Clears the sampled PV values and their sample times.
+        """
+        self._allocateSamples(SAMPLE_CAPACITY)
+        
+    def _allocateSamples(self, capacity: int):
+        """
+        Allocates empty sample ring buffers.
+
+        Each buffer holds the ring twice (sample i is stored at i % capacity and i % capacity + capacity), so the valid
+        samples are always a single contiguous slice and can be handed out as views without unwrapping.
+
+        Args:
+            capacity (int): The number of samples kept.
+        """
+        self._capacity = capacity
+        self._sample_buffer = np.empty(2 * capacity)
+        self._sample_time_buffer = np.empty(2 * capacity)
+        self._rolling_mean_buffer = np.empty(2 * capacity)
+        self._ewm_mean_buffer = np.empty(2 * capacity)
+        self._head = 0  # total number of samples written
+        self.sample_version += 1
+        self._resetRollingMean()
+        self._resetEWMMean()
+        
+    def _resetRollingMean(self):
+        """
+        Recomputes the streamed rolling mean of all samples (after the samples or the rolling window change).
+        """
+        self._rolling_sum = 0.0  # sum of the finite samples among the last `_rolling_window`
+        self._rolling_missing = 0  # number of non-finite samples among them (NaN and ±inf, missing to pandas)
+        window = self._rolling_window
+        if window is None or not self._head:
+            return
+        
+        samples = self.samples
+        self._fillRing(self._rolling_mean_buffer, pd.Series(samples).rolling(window).mean().to_numpy())
+        finite = np.isfinite(samples[-window:])
+        self._rolling_sum = samples[-window:][finite].sum()
+        self._rolling_missing = len(finite) - np.count_nonzero(finite)
+        
+    def _updateRollingMean(self, index: int, sample: float):
+        """
+        Advances the streamed rolling mean by the sample just written: adds it to the running window sum, subtracts the
+        sample that left the window, and stores the mean at the sample's ring buffer index. Like pandas, ±inf samples
+        count as missing, so they are counted instead of summed.
+
+        Args:
+            index (int): The ring buffer index of the sample.
+            sample (float): The sample.
+        """
+        window = self._rolling_window
+        if math.isfinite(sample):
+            self._rolling_sum += sample
+        else:
+            self._rolling_missing += 1
+        if self._head > window:
+            old_sample = self._sample_buffer[(self._head - 1 - window) % self._capacity]
+            if math.isfinite(old_sample):
+                self._rolling_sum -= old_sample
+            else:
+                self._rolling_missing -= 1
+        
+        # Like pandas, NaN until the window is full and while it holds a missing sample
+        mean = self._rolling_sum / window if self._head >= window and not self._rolling_missing else np.nan
+        self._rolling_mean_buffer[index] = self._rolling_mean_buffer[index + self._capacity] = mean
+        
+    def _resetEWMMean(self):
+        """
+        Recomputes the streamed exponentially weighted mean of all samples (after the samples or the EWM kwargs change),
+        along with the weight pandas' recursion gives the current mean.
+        """
+        self._ewm_mean = np.nan  # NaN until the first observation
+        self._ewm_old_weight = 1.0
+        if self._ewm_weights is None or not self._head:
+            return
+        
+        decay, _, adjust = self._ewm_weights
+        samples = self.samples
+        means = pd.Series(samples).ewm(alpha=1 - decay, adjust=adjust).mean().to_numpy()
+        self._fillRing(self._ewm_mean_buffer, means)
+        
+        # The weight decays every sample since the first observation; adjust=True accumulates a unit weight per
+        # observation, adjust=False resets it to 1 on each one (pandas treats non-finite samples as missing)
+        ages = len(samples) - 1 - np.flatnonzero(np.isfinite(samples))
+        if len(ages):
+            self._ewm_mean = means[-1]
+            self._ewm_old_weight = np.sum(decay ** ages) if adjust else decay ** ages[-1]
+            
+    def _updateEWMMean(self, index: int, sample: float):
+        """
+        Advances the streamed exponentially weighted mean by the sample just written, following pandas' recursion
+        (missing values decay the weight of the mean but don't reset it), and stores it at the sample's ring buffer index.
+        Like pandas, ±inf samples count as missing.
+
+        Args:
+            index (int): The ring buffer index of the sample.
+            sample (float): The sample.
+        """
+        decay, new_weight, adjust = self._ewm_weights
+        if not math.isfinite(sample):
+            sample = np.nan
+        mean = self._ewm_mean
+        if mean == mean:
+            old_weight = self._ewm_old_weight * decay
+            if sample == sample:
+                if mean != sample:  # pandas skips this for constant series to avoid rounding errors
+                    mean = (old_weight * mean + new_weight * sample) / (old_weight + new_weight)
+                old_weight = old_weight + new_weight if adjust else 1.0
+            self._ewm_old_weight = old_weight
+        elif sample == sample:
+            mean = sample
+        
+        self._ewm_mean = mean
+        self._ewm_mean_buffer[index] = self._ewm_mean_buffer[index + self._capacity] = mean
+        
+    def _fillRing(self, buffer: np.ndarray, values: np.ndarray):
+        """
+        Stores one value per sample in a ring buffer laid out like the sample ring buffer.
+
+        Args:
+            buffer (ndarray): The ring buffer.
+            values (ndarray): The values, oldest first, aligned with `samples`.
+        """
+        start = max(self._head - self._capacity, 0) % self._capacity
+        positions = np.arange(start, start + len(values)) % self._capacity
+        buffer[positions] = buffer[positions + self._capacity] = values
+
+
+class _ReadJob(QRunnable):
+    """
+    Reads a PV on a thread pool and hands the value to its PVItem like a monitor update, so the GUI thread never waits
+    on the read.
+
+    Methods:
+        __init__: Initializes the _ReadJob with the item and its PV.
+        run: Reads the PV and forwards the value to the item.
+    """
+    def __init__(self, item: PVItem, pv):
+        """
+        Initializes a new _ReadJob instance.
+
+        Args:
+            item (PVItem): The item to receive the value.
+            pv: The PV to read.
+        """
+        super().__init__()
+        self._item = item
+        self._pv = pv
+        
+    def run(self):
+        """
+        Reads the PV and forwards the value to the item, unless the item has moved on to another PV or been deleted.
+        """
+        value = self._pv.get()
+        if not sip.isdeleted(self._item) and self._item.pv is self._pv:
+            self._item._onMonitor(value=value)
 
 
 class ParameterDialog(QDialog):
@@ -238,7 +893,7 @@ class ParameterDialog(QDialog):
         super().__init__()
         
         # Set dialog properties
-        self.setWindowIcon(QIcon(DIALOG_ICON_FILENAME))
+        self.setWindowIcon(_dialog_icon())
         self.setFixedWidth(DIALOG_WIDTH)
         self.setModal(DIALOG_MODALITY)
         
@@ -252,7 +907,7 @@ class ParameterDialog(QDialog):
         self.apply_ok_button = QPushButton("Apply && OK")
         
         # Connect the apply_ok_button to the accept method
-        self.apply_ok_button.pressed.connect(self.accept)
+        self.apply_ok_button.pressed.connect(self.accept, Qt.ConnectionType.DirectConnection)
         
         # Set up the layout
         layout = QGridLayout()
@@ -285,18 +940,16 @@ class ParameterDialog(QDialog):
         Args:
             params: Dictionary containing parameter updates.
         """
-        keys = params.keys()
-            
-        if "name" in keys and params["name"] is not None:
+        if params.get("name") is not None:
             self.setWindowTitle(f"{params['name']}'s Parameters")
             
-        if "color" in keys:
+        if "color" in params:
             self.palette_button.setColor(params["color"])
             
-        if "subplot_id" in keys:
+        if "subplot_id" in params:
             self.subplot_id_spinbox.setValue(params["subplot_id"] + 1)
             
-        if "kwargs" in keys:
+        if "kwargs" in params:
             self.tree.updateKwargs(params["kwargs"])
         
 class KwargTree(QTreeWidget):
@@ -305,6 +958,8 @@ class KwargTree(QTreeWidget):
 
     Methods:
         __init__: Initializes a new KwargTree instance.
+        _addRow: Adds a labeled row with a newly created widget to a section of the tree.
+        _disableEWMRadioButtons: Disables the EWM decay parameters other than the selected one.
         getKwargs: Returns the edited parameters.
         updateKwargs: Updates the tree with the given parameters.
     """
@@ -319,135 +974,77 @@ class KwargTree(QTreeWidget):
         self.setColumnWidth(0, 175)
         self.setHeaderHidden(True)
         self.setUniformRowHeights(True)
+        self.setAnimated(False)  # expand/collapse sections without animating each step
 
-        # ------------ Original ------------
-        og_item = QTreeWidgetItem(self, ["Original"])
-        og_item.setFirstColumnSpanned(True)
-        
-        # Enable item for the "Original" section.
-        og_enable_item = QTreeWidgetItem(og_item, ["Enable"])
-        self.og_checkbox = QCheckBox()
-        self.og_checkbox.setChecked(True)
-        self.setItemWidget(og_enable_item, 1, self.og_checkbox)
-
-        # ------------ Rolling-Window Average ------------
-        rw_item = QTreeWidgetItem(self, ["Rolling Window"])
-        rw_item.setFirstColumnSpanned(True)
-        
-        # Enable item for the "Rolling Window" section.
-        rw_enable_item = QTreeWidgetItem(rw_item, ["Enable"])
-        self.rw_checkbox = QCheckBox()
-        self.setItemWidget(rw_enable_item, 1, self.rw_checkbox)
-        
-        # Window Size item for the "Rolling Window" section.
-        rw_window_item = QTreeWidgetItem(rw_item, ["Window"])
-        rw_window_item.setToolTip(0, "Size of the moving window.")
-        self.rw_window_spinbox = QSpinBox()
-        self.rw_window_spinbox.setAlignment(SPINBOX_ALIGNMENT)
-        self.rw_window_spinbox.setMinimum(1)
-        self.rw_window_spinbox.setToolTip("≥1")
-        self.setItemWidget(rw_window_item, 1, self.rw_window_spinbox)
-        
-        # Center item for the "Rolling Window" section.
-        rw_center_item = QTreeWidgetItem(rw_item, ["Center"])
-        rw_center_item.setToolTip(0, "True: Set the window labels as the center of the window index.\nFalse: Set the window labels as the right edge of the window index.")
-        self.rw_center_checkbox = QCheckBox()
-        self.setItemWidget(rw_center_item, 1, self.rw_center_checkbox)
-        
-        # Closed item for the "Rolling Window" section.
-        rw_closed_item = QTreeWidgetItem(rw_item, ["Closed"])
-        rw_closed_item.setToolTip(0, "Right: The first point in the window is excluded from calculations.\nLeft: The last point in the window is excluded from calculations.\nBoth: No points in the window are excluded from calculations.\nNeither: The first and last points in the window are excluded from calcuations.")
-        self.rw_closed_combobox = QComboBox()
-        self.rw_closed_combobox.addItems(["Right", "Left", "Both", "Neither"])
-        self.setItemWidget(rw_closed_item, 1, self.rw_closed_combobox)
-
-        # ------------ Exponentially-Weighted Means ------------
-        ewm_item = QTreeWidgetItem(self, ["Exponentially Weighted"])
-        ewm_item.setFirstColumnSpanned(True)
-        
-        # Enable item for the "Exponentially Weighted" section.
-        ewm_enable_item = QTreeWidgetItem(ewm_item, ["Enable"])
-        self.ewm_checkbox = QCheckBox()
-        self.setItemWidget(ewm_enable_item, 1, self.ewm_checkbox)
-        
-        # Com item for the "Exponentially Weighted" section.
-        ewm_com_item = QTreeWidgetItem(ewm_item, ["Com"])
-        ewm_com_item.setToolTip(0, "Specify decay in terms of center mass.")
-        self.ewm_com_spinbox = OptionalDoubleSpinBox(0, step=0.25)
-        self.ewm_com_spinbox.spinbox.setToolTip("a = 1/(1+com), for com ≥ 0")
-        self.setItemWidget(ewm_com_item, 1, self.ewm_com_spinbox)
-        
-        # Span item for the "Exponentially Weighted" section.
-        ewm_span_item = QTreeWidgetItem(ewm_item, ["Span"])
-        ewm_span_item.setToolTip(0, "Specify decay in terms of span.")
-        self.ewm_span_spinbox = OptionalDoubleSpinBox(1, step=0.25, comparator=lambda val: 1 <= val <= float("Inf"))
-        self.ewm_span_spinbox.spinbox.setToolTip("a = 2/(span+1), for span ≥ 1")
-        self.setItemWidget(ewm_span_item, 1, self.ewm_span_spinbox)
-        
-        # Half-Life item for the "Exponentially Weighted" section.
-        ewm_halflife_item = QTreeWidgetItem(ewm_item, ["Half-Life"])
-        ewm_halflife_item.setToolTip(0, "Specify decay in terms of half-life.")
-        self.ewm_halflife_spinbox = OptionalDoubleSpinBox(0.25, step=0.25, comparator=lambda val: 0 < val <= float("Inf"))
-        self.ewm_halflife_spinbox.spinbox.setToolTip("a = 1-exp(-ln(2)/halflife), for halflife > 0")
-        self.setItemWidget(ewm_halflife_item, 1, self.ewm_halflife_spinbox)
-        
-        # Alpha item for the "Exponentially Weighted" section.
-        ewm_alpha_item = QTreeWidgetItem(ewm_item, ["Alpha"])
-        ewm_alpha_item.setToolTip(0, "Specify smoothing factor `a` directly.")
-        self.ewm_alpha_spinbox = OptionalDoubleSpinBox(0.1, step=0.1, comparator=lambda val: 0 < val <= 1)
-        self.ewm_alpha_spinbox.spinbox.setToolTip("0<a≤1")
-        self.setItemWidget(ewm_alpha_item, 1, self.ewm_alpha_spinbox)
-        
-        # Adjust item for the "Exponentially Weighted" section.
-        ewm_adjust_item = QTreeWidgetItem(ewm_item, ["Adjust"])
-        ewm_adjust_item.setToolTip(0, "True: Calculate using weights\nFalse: Calculate using recursion")
-        self.ewm_adjust_checkbox = QCheckBox()
-        self.setItemWidget(ewm_adjust_item, 1, self.ewm_adjust_checkbox)
-        
-        # ------------ Adaptive Average ------------
-        aa_item = QTreeWidgetItem(self, ["Adaptive Average"])
-        aa_item.setFirstColumnSpanned(True)
-        
-        # Enable item for the "Adaptive Average" section.
-        adaptive_enable_item = QTreeWidgetItem(aa_item, ["Enable"])
-        self.aa_checkbox = QCheckBox()
-        self.setItemWidget(adaptive_enable_item, 1, self.aa_checkbox)
-        
-        # Phase Threshold item for the "Adaptive Average" section.
-        adaptive_threshold_item = QTreeWidgetItem(aa_item, ["Phase Threshold"])
-        self.aa_threshold_spinbox = QDoubleSpinBox()
-        self.aa_threshold_spinbox.setValue(0.5)
-        self.aa_threshold_spinbox.setSingleStep(0.25)
-        self.aa_threshold_spinbox.setToolTip("The phase change threshold to disable averaging.")
-        self.setItemWidget(adaptive_threshold_item, 1, self.aa_threshold_spinbox)
-        
-         # Number of Points (for calculating average) item for the "Adaptive Average" section.
-        adaptive_threshold_item = QTreeWidgetItem(aa_item, ["Number of Points"])
-        self.aa_pnts_spinbox = QSpinBox()
-        self.aa_pnts_spinbox.setAlignment(SPINBOX_ALIGNMENT)
-        self.aa_pnts_spinbox.setMinimum(1)
-        self.aa_pnts_spinbox.setValue(8)
-        self.aa_pnts_spinbox.setToolTip("Number of points to consider in calculations.")
-        self.setItemWidget(adaptive_threshold_item, 1, self.aa_pnts_spinbox)
-        
-        # Connect signals to disable radio buttons in EWM section when a radio button is clicked.
-        def disableEWMRadioButtons(parent: OptionalDoubleSpinBox):
-            related_optional_spinboxes = [self.ewm_com_spinbox, self.ewm_span_spinbox,
-                                  self.ewm_halflife_spinbox, self.ewm_alpha_spinbox]
-            related_optional_spinboxes.remove(parent)
+        # Build a section item per kwargs section and a row (label + widget) per kwarg, keeping the widgets by their
+        # (section, key) in the kwargs
+        self._widget_map = {}
+        for section, title, rows in KWARG_TREE_SPEC:
+            section_item = QTreeWidgetItem(self, [title])
+            section_item.setFirstColumnSpanned(True)
+            for key, label, tooltip, factory, setters in rows:
+                self._widget_map[(section, key)] = self._addRow(section_item, label, tooltip, factory, setters)
+        
+        # Kwargs with the same structure as the widget map, filled in by getKwargs
+        self._kwargs_template = _default_kwargs()
+        
+        # How to read and set a kwarg value on each type of widget
+        self._getter_map = {QCheckBox: QCheckBox.isChecked,
+                            QSpinBox: QSpinBox.value,
+                            QDoubleSpinBox: QDoubleSpinBox.value,
+                            QComboBox: lambda widget: CLOSED_VALUES[widget.currentIndex()],  # the only combo box
+                            OptionalDoubleSpinBox: OptionalDoubleSpinBox.value}
+        self._setter_map = {QCheckBox: QCheckBox.setChecked,
+                            QSpinBox: QSpinBox.setValue,
+                            QDoubleSpinBox: QDoubleSpinBox.setValue,
+                            QComboBox: lambda widget, value: widget.setCurrentIndex(CLOSED_INDICES.get(value, widget.currentIndex())),
+                            OptionalDoubleSpinBox: OptionalDoubleSpinBox.setValue}
+        
+        # Connect signals to disable radio buttons in EWM section when a radio button is clicked (through one shared slot,
+        # which looks up the decay parameters to disable by the sender)
+        decay_spinboxes = [self._widget_map[("ewm", key)] for key in EWM_DECAY_KEYS]
+        decay_spinboxes[0].setEnabled(True)
+        self._ewm_decay_spinboxes = {spinbox: tuple(other for other in decay_spinboxes if other is not spinbox)
+                                     for spinbox in decay_spinboxes}  # {decay parameter: other decay parameters}
+        for optional_spinbox in decay_spinboxes:
+            optional_spinbox.disableOtherRadioButtons.connect(self._disableEWMRadioButtons, Qt.ConnectionType.DirectConnection)
             
-            if not parent.isEnabled():
-                parent.setEnabled(True)
-                return
-                
-            for optional_spinbox in related_optional_spinboxes:
-                optional_spinbox.setEnabled(False)
+    def _addRow(self, parent: QTreeWidgetItem, label: str, tooltip: str, factory, setters: dict) -> QWidget:
+        """
+        Adds a labeled row with a newly created widget to a section of the tree.
+
+        Args:
+            parent (QTreeWidgetItem): The section item.
+            label (str): The row label.
+            tooltip (str): The label's tool tip, or None.
+            factory: Callable creating the widget.
+            setters (dict): {widget setter name: value} applied to the new widget in order.
+
+        Returns:
+            QWidget: The new widget.
+        """
+        item = QTreeWidgetItem(parent, [label])
+        if tooltip is not None:
+            item.setToolTip(0, tooltip)
+            
+        widget = factory()
+        for setter, value in setters.items():
+            getattr(widget, setter)(value)
+        self.setItemWidget(item, 1, widget)
+        return widget
             
-        self.ewm_com_spinbox.setEnabled(True)
-        self.ewm_com_spinbox.disableOtherRadioButtons.connect(lambda: disableEWMRadioButtons(self.ewm_com_spinbox))
-        self.ewm_span_spinbox.disableOtherRadioButtons.connect(lambda: disableEWMRadioButtons(self.ewm_span_spinbox))
-        self.ewm_halflife_spinbox.disableOtherRadioButtons.connect(lambda: disableEWMRadioButtons(self.ewm_halflife_spinbox))
-        self.ewm_alpha_spinbox.disableOtherRadioButtons.connect(lambda: disableEWMRadioButtons(self.ewm_alpha_spinbox))   
+    @pyqtSlot()
+    def _disableEWMRadioButtons(self):
+        """
+        Disables the EWM decay parameters other than the one whose radio button was clicked (the signal's sender).
+        """
+        parent = self.sender()
+        if not parent.isEnabled():
+            parent.setEnabled(True)
+            return
+            
+        for optional_spinbox in self._ewm_decay_spinboxes[parent]:
+            optional_spinbox.setEnabled(False)
 
     def getKwargs(self) -> dict:
         """
@@ -456,27 +1053,10 @@ class KwargTree(QTreeWidget):
         Returns:
             dict: A dictionary of keyword arguments for original, rolling window, ewm, and adaptive average.
         """
-        d = {}
-        
-        d["original"] = {"enabled": self.og_checkbox.isChecked()}
-        
-        d["rolling_window"] = {"enabled": self.rw_checkbox.isChecked(),
-                               "window": self.rw_window_spinbox.value(),
-                               "center": self.rw_center_checkbox.isChecked(),
-                               "closed": self.rw_closed_combobox.currentText().lower()}
-        
-        d["ewm"] = {"enabled": self.ewm_checkbox.isChecked(),
-                    "com": self.ewm_com_spinbox.value(),
-                    "span": self.ewm_span_spinbox.value(),
-                    "halflife": self.ewm_halflife_spinbox.value(),
-                    "alpha": self.ewm_alpha_spinbox.value(),
-                    "adjust": self.ewm_adjust_checkbox.isChecked()}
-        
-        d["adaptive"] = {"enabled": self.aa_checkbox.isChecked(),
-                         "phase_threshold": self.aa_threshold_spinbox.value(),
-                         "n_avg": self.aa_pnts_spinbox.value()}
-        
-        return d
+        # Read the widgets into the preallocated template, then hand out a copy of each section
+        for (section, key), widget in self._widget_map.items():
+            self._kwargs_template[section][key] = self._getter_map[type(widget)](widget)
+        return {section: section_kwargs.copy() for section, section_kwargs in self._kwargs_template.items()}
     
     def updateKwargs(self, kwargs: dict):
         """
@@ -485,49 +1065,16 @@ class KwargTree(QTreeWidget):
         Args:
             kwargs (dict): A dictionary containing parameters to update the tree widget.
         """
-        og = kwargs.get("original", {})
-        rw = kwargs.get("rolling_window", {})
-        ewm = kwargs.get("ewm", {})
-        aa = kwargs.get("adaptive", {})
-        
-        if "enabled" in og.keys():
-            self.og_checkbox.setChecked(og["enabled"])
-            
-        rw_keys = rw.keys()
-        if "enabled" in rw_keys:
-            self.rw_checkbox.setChecked(rw["enabled"])
-        if "window" in rw_keys:
-            self.rw_window_spinbox.setValue(rw["window"])
-        if "center" in rw_keys:
-            self.rw_center_checkbox.setChecked(rw["center"])
-        if "closed" in rw_keys:
-            self.rw_closed_combobox.setCurrentText(rw["closed"].capitalize())
-            
-        ewm_keys = ewm.keys()
-        if "enabled" in ewm_keys:
-            self.ewm_checkbox.setChecked(ewm["enabled"])
-        if "com" in ewm_keys:
-            self.ewm_com_spinbox.setValue(ewm["com"])
-            self.ewm_com_spinbox.setEnabled(False if ewm["com"] is None else True)
-        if "span" in ewm_keys:
-            self.ewm_span_spinbox.setValue(ewm["span"])
-            self.ewm_span_spinbox.setEnabled(False if ewm["span"] is None else True)
-        if "halflife" in ewm_keys:
-            self.ewm_halflife_spinbox.setValue(ewm["halflife"])
-            self.ewm_halflife_spinbox.setEnabled(False if ewm["halflife"] is None else True)
-        if "alpha" in ewm_keys:
-            self.ewm_alpha_spinbox.setValue(ewm["alpha"])
-            self.ewm_alpha_spinbox.setEnabled(False if ewm["alpha"] is None else True)
-        if "adjust" in ewm_keys:
-            self.ewm_adjust_checkbox.setChecked(ewm["adjust"])
-            
-        aa_keys = aa.keys()
-        if "enabled" in aa_keys:
-            self.aa_checkbox.setChecked(aa["enabled"])
-        if "phase_threshold" in aa_keys:
-            self.aa_threshold_spinbox.setValue(aa["phase_threshold"])
-        if "n_avg" in aa_keys:
-            self.aa_pnts_spinbox.setValue(aa["n_avg"])
+        # Set each given kwarg on its widget with all of the widgets' signals blocked
+        with ExitStack() as stack:
+            for widget in self._widget_map.values():
+                stack.enter_context(QSignalBlocker(widget))
+                
+            for section, section_kwargs in kwargs.items():
+                for key, value in section_kwargs.items():
+                    widget = self._widget_map.get((section, key))
+                    if widget is not None:
+                        self._setter_map[type(widget)](widget, value)
         
     
 class OptionalDoubleSpinBox(QWidget):
@@ -541,15 +1088,18 @@ class OptionalDoubleSpinBox(QWidget):
 
         radiobutton (QRadioButton): The radio button to enable or disable the spin box.
         spinbox (QDoubleSpinBox): The double spin box for numerical input.
+        _value_proxy (SignalProxy): Rate-limits the spin box's valueChanged signal to onValueChanged.
 
     Signals:
         disableOtherRadioButtons (pyqtSignal): Signal emitted to disable other radio buttons.
 
     Methods:
+        _onRadioButtonClicked: Slot method to enable the spin box when its radio button is clicked.
         onValueChanged: Slot method to handle value changes in the spin box.
         value: Get the current value of the spin box.
         setValue: Set the value of the spin box.
         setEnabled: Enable or disable the spin box and radio button.
+        setToolTip: Set the tool tip of the spin box.
         isEnabled: Check if the spin box is enabled.
 
     """
@@ -580,8 +1130,7 @@ class OptionalDoubleSpinBox(QWidget):
         
         # Set up radio button
         self.radiobutton = QRadioButton()
-        self.radiobutton.clicked.connect(lambda: self.setEnabled(True))
-        self.radiobutton.clicked.connect(lambda: self.disableOtherRadioButtons.emit())
+        self.radiobutton.clicked.connect(self._onRadioButtonClicked, Qt.ConnectionType.DirectConnection)
         self.radiobutton.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         
         # Set up double spin box
@@ -589,7 +1138,9 @@ class OptionalDoubleSpinBox(QWidget):
         self.spinbox.setAlignment(SPINBOX_ALIGNMENT)
         self.spinbox.setValue(initial_value)
         self.spinbox.setSingleStep(step)
-        self.spinbox.valueChanged.connect(self.onValueChanged)
+        
+        # Validate bursts of edits (key repeat, wheel) at a limited rate; value() flushes a pending validation
+        self._value_proxy = SignalProxy(self.spinbox.valueChanged, rateLimit=SPINBOX_RATE_LIMIT, slot=self.onValueChanged)
         
         # Set up layout
         layout = QHBoxLayout()
@@ -599,13 +1150,25 @@ class OptionalDoubleSpinBox(QWidget):
         self.setLayout(layout)
         
     
-    def onValueChanged(self, value: float) -> None:
+    @pyqtSlot()
+    def _onRadioButtonClicked(self):
         """
-        Slot method to handle value changes in the spin box.
+        Enables the spin box and asks the other radio buttons of its group to disable theirs.
+        """
+        self.setEnabled(True)
+        self.disableOtherRadioButtons.emit()
+        
+    @pyqtSlot(object)
+    def onValueChanged(self, args: tuple = ()) -> None:
+        """
+        Slot method to handle value changes in the spin box. Reverts the spin box to its previous value if the current
+        one is out of bounds.
 
         Args:
-            value (float): The new value of the spin box.
+            args (tuple): The arguments of the latest rate-limited valueChanged signal (unused; the current value is
+                validated).
         """
+        value = self.spinbox.value()
         self.spinbox.blockSignals(True)
         if not self.comparator(value - self.ERROR) or not self.comparator(value + self.ERROR):
             self.spinbox.setValue(self.prev_value)
@@ -620,6 +1183,7 @@ class OptionalDoubleSpinBox(QWidget):
         Returns:
             float: The current value of the spin box, or None if disabled.
         """
+        self._value_proxy.flush()
         return self.spinbox.value() if self.isEnabled() else None
     
     def setValue(self, value):
@@ -627,15 +1191,18 @@ class OptionalDoubleSpinBox(QWidget):
         Set the value of the spin box.
 
         Args:
-            value: The value to set. If float, the spin box is enabled with the given value.
+            value: The value to set. If a number, the spin box is enabled with the given value.
                    If None, the spin box is disabled.
         """
-        if isinstance(value, float):
+        if isinstance(value, (int, float)):
             self.setEnabled(True)
-            self.spinbox.setValue(value)
+            with QSignalBlocker(self.spinbox):
+                self.spinbox.setValue(float(value))
+            self.prev_value = self.spinbox.value()
         elif value is None:
             self.setEnabled(False)
             
+    @pyqtSlot(bool)
     def setEnabled(self, b: bool):
         """
         Enable or disable the spin box and radio button.
@@ -646,6 +1213,15 @@ class OptionalDoubleSpinBox(QWidget):
         self.radiobutton.setChecked(b)
         self.spinbox.setEnabled(b)
         
+    def setToolTip(self, tooltip: str):
+        """
+        Set the tool tip of the spin box.
+
+        Args:
+            tooltip (str): The tool tip text.
+        """
+        self.spinbox.setToolTip(tooltip)
+        
     def isEnabled(self) -> bool:
         """
         Check if the spin box is enabled.
@@ -663,14 +1239,18 @@ class PaletteButton(QPushButton):
         setColor: Set the color of the button.
         _showColorDialog: Show the QColorDialog when the button is pressed.
     """
+    _style_sheets = {}  # {color: style sheet}, shared by all palette buttons
+    
     def __init__(self):
         """
         Initializes a new PaletteButton instance.
         """
         super().__init__()
+        self.color = None
         self.setColor("")
-        self.pressed.connect(self._showColorDialog)
+        self.pressed.connect(self._showColorDialog, Qt.ConnectionType.DirectConnection)
         
+    @pyqtSlot(str)
     def setColor(self, color: str):
         """
         Set the color of the button.
@@ -678,9 +1258,17 @@ class PaletteButton(QPushButton):
         Args:
             color (str): The color in hex-code format.
         """
+        if color == self.color:
+            return  # restyling re-parses the style sheet, so skip it when nothing changes
+        
+        style_sheet = PaletteButton._style_sheets.get(color)
+        if style_sheet is None:
+            style_sheet = PaletteButton._style_sheets[color] = f"background-color: {color};"  # hex-code
+        
         self.color = color
-        self.setStyleSheet(f"background-color: {color};")  # hex-code
+        self.setStyleSheet(style_sheet)
         
+    @pyqtSlot()
     def _showColorDialog(self):
         """
         Show the QColorDialog and set the color if valid.
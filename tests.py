@@ -1,117 +1,313 @@
-import sys
-import unittest
-from copy import deepcopy
+from time import monotonic
+from types import MappingProxyType
+from unittest.mock import patch
 
-from PyQt6.QtWidgets import QApplication
+import numpy as np
+import pytest
+from pandas import DataFrame, Series
+from PyQt6.QtTest import QTest
 
-from lib.pv_item import PVItem
-from lib.pv_editor import PVEditor
-from lib.clock import Clock
-        
-class PVItemTest(unittest.TestCase):
+from lib.menu_bar import read_data_file, write_data_file
+from lib.pv_item import PARAMS_CHANGED_DELAY, connection_queue
+
+# Read-only so that no test can change the expected values of another; pass `_kwargs_copy()` to code that keeps them
+KWARGS = MappingProxyType({section: MappingProxyType(kwargs) for section, kwargs in {
+    "original": {'enabled': False},
+    "rolling_window": {'enabled': True, 'window': 7, 'center': True, 'closed': 'right'},
+    "ewm": {'enabled': False, 'com': None, 'span': None, 'halflife': 0.5, 'alpha': None, 'adjust': True},
+    "adaptive": {'enabled': True, 'phase_threshold': 2.3, 'n_avg': 10}}.items()})
+
+
+def _kwargs_copy():
+    """
+    Returns a mutable copy of `KWARGS`.
+    """
+    return {section: dict(kwargs) for section, kwargs in KWARGS.items()}
+
+
+def _waitFor(condition, timeout=1000):
+    """
+    Processes events until `condition()` holds or `timeout` ms have passed, and returns whether it holds.
+    """
+    deadline = monotonic() + timeout / 1000
+    while not condition() and monotonic() < deadline:
+        QTest.qWait(10)
+    return condition()
+
+
+def _sampleEach(pv_item, samples):
+    """
+    Samples each of `samples` in turn, as if a monitor update had arrived before every clock tick.
+    """
+    for sample in samples:
+        pv_item._onMonitor(value=sample)
+        pv_item.sample()
+
+
+class TestPVItem:
     NAME = "dummy_pv_0"
     COLOR = "#123456"
     SUBPLOT_ID = 10
-    KWARGS = {"original": {'enabled': False},
-            "rolling_window": {'enabled': True, 'window': 7, 'center': True, 'closed': 'right'},
-            "ewm": {'enabled': False, 'com': None, 'span': None, 'halflife': 0.5, 'alpha': None, 'adjust': True},
-            "adaptive": {'enabled': True, 'phase_threshold': 2.3, 'n_avg': 10}}
-
-    def updateSingleParamTest(self):
-        # NAME
-        item = PVItem()
-        item.updateParams({"name": self.NAME})
-        self.assertEqual(self.NAME, item.params["name"])
-        self.assertEqual(f"{self.NAME}'s Parameters", item.param_dialog.windowTitle())
-        
-        # COLOR
-        item = PVItem()
-        item.updateParams({"color": self.COLOR})
-        self.assertEqual(self.COLOR, item.params["color"])
-        self.assertEqual(self.COLOR, item.param_dialog.palette_button.color)
-        
-        # SUBPLOT ID
-        item = PVItem()
-        item.updateParams({"subplot_id": self.SUBPLOT_ID})
-        self.assertEqual(self.SUBPLOT_ID, item.params["subplot_id"])
-        self.assertEqual(self.SUBPLOT_ID, item.param_dialog.subplot_id_spinbox.value())
-        
-        # KWARGS
-        item = PVItem()
-        item.updateParams({"kwargs": self.KWARGS})
-        self.assertEqual(self.KWARGS, item.params["kwargs"])
-        self.assertEqual(self.KWARGS, item.param_dialog.tree.getKwargs())
-        
-    def updateParamsTest(self):
-        test_params = {"name": self.NAME, "color": self.COLOR, "subplot_id": self.SUBPLOT_ID, "kwargs": self.KWARGS}
-        test_params_copy = deepcopy(test_params)  # to test ParamDialog.getParams()
-        del test_params_copy["name"]
-        
-        # PARAM SUBSET
-        item = PVItem()
-        item.updateParams({"color": self.COLOR, "subplot_id": self.SUBPLOT_ID})
-        self.assertEqual(self.COLOR, item.params["color"])
-        self.assertEqual(self.COLOR, item.param_dialog.palette_button.color)
-        self.assertEqual(self.SUBPLOT_ID, item.params["subplot_id"])
-        self.assertEqual(self.SUBPLOT_ID, item.param_dialog.subplot_id_spinbox.value())
-        
-        # ALL PARAMS
-        item = PVItem()
-        item.updateParams(test_params)
-        self.assertEqual(test_params, item.params)
-        self.assertEqual(f"{test_params['name']}'s Parameters", item.param_dialog.windowTitle())
-        self.assertEqual(test_params['color'], item.param_dialog.palette_button.color)
-        self.assertEqual(test_params['subplot_id'], item.param_dialog.subplot_id_spinbox.value())
-        self.assertEqual(test_params['kwargs'], item.param_dialog.tree.getKwargs())
-        self.assertEqual(test_params_copy, item.param_dialog.getParams())
-        
-    def runTest(self):
-        self.updateSingleParamTest()
-        self.updateParamsTest()
-
-
-class PVEditorTest(unittest.TestCase):
+    KWARGS = KWARGS
+    RING_CAPACITY = 16
+    STREAMED_SAMPLES = np.tile([1.5, np.inf, 2.0, np.nan, -np.inf, 4.0, 3.0, 3.0, 3.0], 5)  # wraps the ring around
+
+    @pytest.mark.parametrize("key, value, read_widget, widget_value", [
+        pytest.param("name", NAME, lambda item: item.param_dialog.windowTitle(), f"{NAME}'s Parameters", id="name"),
+        pytest.param("color", COLOR, lambda item: item.param_dialog.palette_button.color, COLOR, id="color"),
+        pytest.param("subplot_id", SUBPLOT_ID, lambda item: item.param_dialog.subplot_id_spinbox.value(),
+                     SUBPLOT_ID + 1, id="subplot_id"),  # shown 1-based
+        pytest.param("kwargs", _kwargs_copy(), lambda item: item.param_dialog.tree.getKwargs(), KWARGS, id="kwargs"),
+    ])
+    def test_update_single_param(self, pv_item, key, value, read_widget, widget_value):
+        pv_item.updateParams({key: value})
+        assert value == pv_item.params[key]
+        assert widget_value == read_widget(pv_item)
+        
+    def test_update_param_subset(self, pv_item):
+        pv_item.updateParams({"color": self.COLOR, "subplot_id": self.SUBPLOT_ID})
+        assert self.COLOR == pv_item.params["color"]
+        assert self.COLOR == pv_item.param_dialog.palette_button.color
+        assert self.SUBPLOT_ID == pv_item.params["subplot_id"]
+        assert self.SUBPLOT_ID + 1 == pv_item.param_dialog.subplot_id_spinbox.value()  # shown 1-based
+        
+    def test_update_all_params(self, pv_item):
+        test_params = {"name": self.NAME, "color": self.COLOR, "subplot_id": self.SUBPLOT_ID, "kwargs": _kwargs_copy()}
+        test_params_copy = {"color": self.COLOR, "subplot_id": self.SUBPLOT_ID, "kwargs": self.KWARGS}  # to test ParamDialog.getParams()
+        
+        pv_item.updateParams(test_params)
+        assert test_params == pv_item.params
+        assert f"{test_params['name']}'s Parameters" == pv_item.param_dialog.windowTitle()
+        assert test_params['color'] == pv_item.param_dialog.palette_button.color
+        assert test_params['subplot_id'] + 1 == pv_item.param_dialog.subplot_id_spinbox.value()  # shown 1-based
+        assert test_params['kwargs'] == pv_item.param_dialog.tree.getKwargs()
+        assert test_params_copy == pv_item.param_dialog.getParams()
+
+    @pytest.mark.parametrize("flush", [True, False], ids=["flushed", "timed_out"])
+    def test_debounced_params_changed(self, pv_item, flush):
+        emitted = []
+        pv_item.paramsChanged.connect(emitted.append)
+        pv_item.updateParams({"color": self.COLOR})
+        pv_item.updateParams({"subplot_id": self.SUBPLOT_ID})
+        pv_item.updateParams({"kwargs": _kwargs_copy()})
+        assert [] == emitted
+        
+        if flush:
+            pv_item.flushParamsChanged()
+        else:
+            assert _waitFor(lambda: emitted, timeout=10 * PARAMS_CHANGED_DELAY)
+        QTest.qWait(2 * PARAMS_CHANGED_DELAY)  # nothing else is pending
+        assert [pv_item.params] == emitted
+        assert (self.COLOR, self.SUBPLOT_ID) == (emitted[0]["color"], emitted[0]["subplot_id"])
+        
+    @pytest.mark.parametrize("previous_name", [None, "dummy_pv_1"])
+    def test_failed_deferred_connection(self, pv_item, pv_editor, previous_name):
+        pv_item.updateParams({"name": previous_name})
+        previous_pv = pv_item.pv
+        with patch.object(pv_item, "_showError") as show_error, connection_queue():
+            pv_item.updateParams({"name": "unknown_pv"})
+        show_error.assert_called_once()
+        
+        # The new name is rejected, like when connecting right away
+        assert previous_name == pv_item.params["name"]
+        assert previous_pv is pv_item.pv
+        assert pv_editor.itemByName("unknown_pv") is None
+        assert (previous_name or "") == pv_item.line_edit.text()
+        assert (previous_name is not None) == pv_item._children_shown
+        if previous_name is not None:
+            assert pv_item is pv_editor.itemByName(previous_name)
+        
+    @pytest.fixture
+    def small_pv_item(self, pv_item, monkeypatch):
+        """
+        Returns the `pv_item` fixture with ring buffers of `RING_CAPACITY` samples.
+        """
+        monkeypatch.setattr("lib.pv_item.SAMPLE_CAPACITY", self.RING_CAPACITY)
+        pv_item.clearSamples()
+        return pv_item
+        
+    def test_streamed_rolling_mean(self, small_pv_item):
+        kwargs = _kwargs_copy()
+        kwargs["rolling_window"].update(window=3, center=False)
+        kwargs["adaptive"]["enabled"] = False
+        small_pv_item.updateParams({"kwargs": kwargs})
+        _sampleEach(small_pv_item, self.STREAMED_SAMPLES)
+        
+        expected = Series(self.STREAMED_SAMPLES).rolling(3).mean()
+        np.testing.assert_allclose(expected[-self.RING_CAPACITY:], small_pv_item.rollingMean())
+        
+    @pytest.mark.parametrize("adjust", [True, False])
+    def test_streamed_ewm(self, small_pv_item, adjust):
+        ewm_kwargs = {'com': None, 'span': None, 'halflife': None, 'alpha': 0.3, 'adjust': adjust}
+        kwargs = _kwargs_copy()
+        kwargs["rolling_window"]["enabled"] = kwargs["adaptive"]["enabled"] = False
+        kwargs["ewm"] = {'enabled': True, **ewm_kwargs}
+        small_pv_item.updateParams({"kwargs": kwargs})
+        _sampleEach(small_pv_item, self.STREAMED_SAMPLES)
+        
+        expected = Series(self.STREAMED_SAMPLES).ewm(**ewm_kwargs).mean()
+        np.testing.assert_allclose(expected[-self.RING_CAPACITY:], small_pv_item.ewmMean())
+        
+    def test_ewm_of_limited_samples(self, pv_item):
+        ewm_kwargs = {'com': None, 'span': None, 'halflife': None, 'alpha': 0.5, 'adjust': False}
+        kwargs = _kwargs_copy()
+        kwargs["rolling_window"]["enabled"] = kwargs["adaptive"]["enabled"] = False
+        kwargs["ewm"] = {'enabled': True, **ewm_kwargs}
+        pv_item.updateParams({"kwargs": kwargs})
+        pv_item.setSamples(np.arange(10.0), np.arange(10.0))
+        
+        # Streamed over all samples
+        assert pv_item.calcKwargs() is None
+        np.testing.assert_allclose(Series(np.arange(10.0)).ewm(**ewm_kwargs).mean(), pv_item.ewmMean())
+        
+        # Left to the calculator when the data point limit leaves samples out (as the EWM of the window differs)
+        assert pv_item.ewmMean(4) is None
+        assert ewm_kwargs == pv_item.calcKwargs(4)["ewm"]
+
+
+class TestPVEditor:
     ADD_ITEM_CALL_COUNT = 5
     DEFAULT_ITEM_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", 
                            "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
 
-    def runTest(self):
-        pv_editor = PVEditor()
-        
+    def test_add_items(self, pv_editor):
         # ADD ITEMS
-        for _ in range(self.ADD_ITEM_CALL_COUNT):
-            pv_editor.addItem()
-        self.assertEqual(self.ADD_ITEM_CALL_COUNT, pv_editor.table.rowCount())
+        with pv_editor.batchUpdates():
+            for _ in range(self.ADD_ITEM_CALL_COUNT):
+                pv_editor.addItem()
+        assert self.ADD_ITEM_CALL_COUNT == pv_editor.table.rowCount()
         
         # ITEMS ASSIGNED CORRECT COLOR
-        for i, item in enumerate(pv_editor):
-            self.assertEqual(self.DEFAULT_ITEM_COLORS[i], item.params["color"])
-            
-        # CLEAR
-        pv_editor.clear()
-        self.assertEqual(0, pv_editor.table.rowCount())
+        assert self.DEFAULT_ITEM_COLORS[:self.ADD_ITEM_CALL_COUNT] == [item.params["color"] for item in pv_editor]
+        
+    @pytest.fixture
+    def filled_pv_editor(self, pv_editor):
+        with pv_editor.batchUpdates():
+            for _ in range(self.ADD_ITEM_CALL_COUNT):
+                pv_editor.addItem()
+        return pv_editor
+        
+    def test_reset(self, filled_pv_editor):
+        filled_pv_editor.reset()
+        assert 0 == filled_pv_editor.table.rowCount()
+        assert [] == list(filled_pv_editor)
+        
+    def test_add_named_and_unnamed_items(self, pv_editor, slot_exceptions):
+        with pv_editor.batchUpdates():
+            pv_editor.addItem()
+            pv_editor.addItem().updateParams({"name": "dummy_pv_0"})
+        assert [] == slot_exceptions
         
 
-class ClockTest(unittest.TestCase):
+class TestClock:
     START_TEXT = "▶"
     STOP_TEXT = "■"
     HZ = 20
     
-    def runTest(self):
-        clock = Clock()
-        
-        # TOGGLE
-        self.assertFalse(clock.timer.isActive())
-        self.assertEqual(self.START_TEXT, clock.toggle_button.text())
+    @pytest.fixture
+    def mock_timer(self, clock):
+        # A mock timer keeps the test off the Qt event loop: nothing is scheduled and no timeouts fire
+        with patch.object(clock, "timer") as timer:
+            timer.isActive.return_value = False
+            yield timer
+    
+    def test_toggle(self, clock, mock_timer):
+        assert self.START_TEXT == clock.toggle_button.text()
         clock.toggle()
-        self.assertEqual(self.STOP_TEXT, clock.toggle_button.text())
-        self.assertTrue(clock.timer.isActive())
+        assert self.STOP_TEXT == clock.toggle_button.text()
+        mock_timer.start.assert_called_once_with()
         
-        # INTERVAL
+    def test_interval(self, clock, mock_timer):
         clock.hz_spinbox.setValue(self.HZ)
-        self.assertEqual(int(1000 / self.HZ), clock.timer.interval())
+        mock_timer.setInterval.assert_called_with(int(1000 / self.HZ))
 
-if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    unittest.main()
-    sys.exit(app.exec())
\ No newline at end of file
+
+class TestCalculator:
+    CALC_KWARGS = MappingProxyType({"rolling_window": None, "ewm": None, "adaptive": None})
+    SAMPLES = np.arange(10.0)
+    SAMPLE_TIMES = np.arange(100.0, 110.0)
+    
+    def test_batched_results(self, calculator, pv_item):
+        calc_kwargs = {"rolling_window": {"window": 3}, "ewm": {"alpha": 0.5}, "adaptive": {"n_avg": 4}}
+        calculated = []
+        calculator.calculated.connect(calculated.append)  # queued, like in the main window
+        calculator.submit([(pv_item, self.SAMPLES, self.SAMPLE_TIMES, 0, calc_kwargs)])
+        assert _waitFor(lambda: calculated)
+        QTest.qWait(50)
+        
+        # One emission carries every kind, each with the snapshot's sample times
+        assert 1 == len(calculated)
+        assert ["RW", "EWM", "AA"] == [kind for kind, _, _, _ in calculated[0]]
+        for kind, item, sample_times, result in calculated[0]:
+            assert pv_item is item
+            assert sample_times is self.SAMPLE_TIMES
+            assert len(self.SAMPLES) == len(result)
+        np.testing.assert_allclose(Series(self.SAMPLES).rolling(3).mean(), calculated[0][0][3])
+        np.testing.assert_allclose(Series(self.SAMPLES).ewm(alpha=0.5).mean(), calculated[0][1][3])
+        
+    def test_failing_item(self, calculator, pv_editor):
+        failing_item, item = pv_editor.addItem(), pv_editor.addItem()
+        ewm_kwargs = {**self.CALC_KWARGS, "ewm": {"com": 1.0, "span": 2.0}}  # both decay parameters: pandas raises
+        rw_kwargs = {**self.CALC_KWARGS, "rolling_window": {"window": 2}}
+        failed, calculated = [], []
+        calculator.failed.connect(lambda item, error_message: failed.append(item))  # queued, like in the main window
+        calculator.calculated.connect(calculated.append)
+        calculator.submit([(failing_item, self.SAMPLES, self.SAMPLE_TIMES, 0, ewm_kwargs),
+                           (item, self.SAMPLES, self.SAMPLE_TIMES, 0, rw_kwargs)])
+        assert _waitFor(lambda: calculated)
+        assert [failing_item] == failed
+        assert [("RW", item)] == [(kind, result_item) for kind, result_item, _, _ in calculated[0]]
+        
+        # The worker keeps calculating later snapshots, and reports the same failure only once
+        assert calculator.isRunning()
+        calculator.submit([(failing_item, self.SAMPLES, self.SAMPLE_TIMES, 1, ewm_kwargs),
+                           (item, self.SAMPLES, self.SAMPLE_TIMES, 1, rw_kwargs)])
+        assert _waitFor(lambda: len(calculated) == 2)
+        assert [failing_item] == failed
+
+
+class TestDataFile:
+    COLUMNS = {"dummy_pv_0_samples": [1.5, 2.0], "dummy_pv_0_sample_times": [10.0, 11.0],
+               "dummy_pv_1_samples": [3.25], "dummy_pv_1_sample_times": [11.0]}
+    
+    @pytest.mark.parametrize("ext", [".json", ".csv", ".feather", ".parquet"])
+    def test_round_trip(self, tmp_path, ext):
+        file_path = str(tmp_path / f"data{ext}")
+        write_data_file(file_path, self.COLUMNS)
+        pairs = read_data_file(file_path)
+        np.testing.assert_array_equal([1.5, 2.0], pairs["dummy_pv_0"][0])
+        np.testing.assert_array_equal([10.0, 11.0], pairs["dummy_pv_0"][1])
+        np.testing.assert_array_equal([np.nan, 3.25], pairs["dummy_pv_1"][0])  # front-padded to the longest column
+        
+    def test_read_json_array(self, tmp_path):
+        # JSON data files saved by earlier versions
+        file_path = str(tmp_path / "data.json")
+        DataFrame({"dummy_pv_0_samples": [1.5, 2.0], "dummy_pv_0_sample_times": [10.0, 11.0]}).to_json(file_path, orient="records")
+        pairs = read_data_file(file_path)
+        np.testing.assert_array_equal([1.5, 2.0], pairs["dummy_pv_0"][0])
+        np.testing.assert_array_equal([10.0, 11.0], pairs["dummy_pv_0"][1])
+        
+    @pytest.mark.parametrize("columns, expected", [
+        pytest.param({}, {}, id="no_columns"),
+        pytest.param({"dummy_pv_0_samples": [], "dummy_pv_0_sample_times": []}, {"dummy_pv_0": 0}, id="no_samples"),
+    ])
+    @pytest.mark.parametrize("ext", [".json", ".csv", ".feather", ".parquet"])
+    def test_read_empty(self, tmp_path, ext, columns, expected):
+        file_path = str(tmp_path / f"data{ext}")
+        write_data_file(file_path, columns)
+        if ext == ".json":
+            expected = {}  # JSON Lines has no header row to keep the names of columns without samples
+        assert expected == {name: len(samples) for name, (samples, _) in read_data_file(file_path).items()}
+        
+    @pytest.mark.parametrize("header", ["dummy_pv_1_samples", "dummy_pv_1_sample_times"])
+    def test_read_incomplete_pair(self, tmp_path, header):
+        file_path = str(tmp_path / "data.csv")
+        write_data_file(file_path, {"dummy_pv_0_samples": [1.5], "dummy_pv_0_sample_times": [10.0], header: [2.0]})
+        with pytest.raises(ValueError, match="'dummy_pv_1'"):
+            read_data_file(file_path)
+            
+    def test_read_unsupported_json(self, tmp_path):
+        file_path = tmp_path / "data.json"
+        file_path.write_text('"dummy_pv_0"')
+        with pytest.raises(ValueError, match="Unsupported data file format"):
+            read_data_file(str(file_path))